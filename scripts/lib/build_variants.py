@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+
+This file is part of a Moko Consulting project.
+
+SPDX-License-Identifier: GPL-3.0-or-later
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+FILE INFORMATION
+DEFGROUP: MokoStandards.Scripts
+INGROUP: MokoStandards.Library
+REPO: https://github.com/mokoconsulting-tech/MokoStandards
+PATH: /scripts/lib/build_variants.py
+VERSION: 05.00.00
+BRIEF: Recognise build output named after a source file next to it, shared by the validators
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+# Build output named after a source file next to it (menu-es5.js, app.bundle.js)
+BUILD_VARIANT_NAME = re.compile(r'^(?P<stem>.+?)(?:[.-]min|-es5|[.-]bundle)(?P<suffix>\.[^.]+)$')
+
+
+def build_variant_source(filepath: Path) -> Optional[Path]:
+    """Return the source file a build variant was produced from.
+
+    The name alone is not enough: menu-es5.js is only a build variant when
+    menu.js exists in the same directory.
+
+    Returns:
+        Path of the unsuffixed sibling, or None if filepath is not a build
+        variant
+    """
+    match = BUILD_VARIANT_NAME.match(filepath.name)
+    if match is None:
+        return None
+    source = filepath.parent / f"{match.group('stem')}{match.group('suffix')}"
+    return source if source.exists() else None
+
+
+def is_build_variant(filepath: Path) -> bool:
+    """Check whether a file is build output of a source file next to it."""
+    return build_variant_source(filepath) is not None
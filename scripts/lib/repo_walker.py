@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+
+This file is part of a Moko Consulting project.
+
+SPDX-License-Identifier: GPL-3.0-or-later
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+FILE INFORMATION
+DEFGROUP: MokoStandards.Scripts
+INGROUP: MokoStandards.Library
+REPO: https://github.com/mokoconsulting-tech/MokoStandards
+PATH: /scripts/lib/repo_walker.py
+VERSION: 05.00.00
+BRIEF: Pruning repository walker with .gitignore support shared by the validators
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+# Directories never descended into
+DEFAULT_EXCLUDE_DIRS = {'.git', 'vendor', 'node_modules'}
+
+
+class FileEntry:
+    """A file found by walk_repository.
+
+    Stat data is fetched at most once and cached; when the entry comes from
+    os.scandir the directory listing already provides the file type.
+    """
+
+    __slots__ = ('path', 'rel_path', '_dir_entry', '_stat')
+
+    def __init__(self, path: Path, rel_path: str, dir_entry: Optional[os.DirEntry] = None):
+        """
+        Create an entry.
+
+        Args:
+            path: Full path of the file
+            rel_path: Path relative to the walk root, using '/' separators
+            dir_entry: scandir entry the file was found through, if any
+        """
+        self.path = path
+        self.rel_path = rel_path
+        self._dir_entry = dir_entry
+        self._stat: Optional[os.stat_result] = None
+
+    @classmethod
+    def from_path(cls, path: Path, root: Path) -> 'FileEntry':
+        """Create an entry for a path that was not found by walking."""
+        try:
+            rel_path = path.relative_to(root).as_posix()
+        except ValueError:
+            rel_path = path.as_posix()
+        return cls(path, rel_path)
+
+    def stat(self) -> os.stat_result:
+        """Return (cached) stat data for the file."""
+        if self._stat is None:
+            if self._dir_entry is not None:
+                self._stat = self._dir_entry.stat()
+            else:
+                self._stat = self.path.stat()
+        return self._stat
+
+    @property
+    def size(self) -> int:
+        """File size in bytes."""
+        return self.stat().st_size
+
+    @property
+    def mtime_ns(self) -> int:
+        """File modification time in nanoseconds."""
+        return self.stat().st_mtime_ns
+
+    @property
+    def name(self) -> str:
+        """File name."""
+        return self.path.name
+
+    @property
+    def suffix(self) -> str:
+        """File extension including the dot."""
+        return self.path.suffix
+
+    def __repr__(self) -> str:
+        return f"FileEntry({self.rel_path!r})"
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression."""
+    parts = []
+    index = 0
+    length = len(pattern)
+
+    while index < length:
+        char = pattern[index]
+        if pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+        elif pattern.startswith('/**', index) and index + 3 == length:
+            parts.append('/.*')
+            index += 3
+        elif pattern.startswith('**', index):
+            parts.append('.*')
+            index += 2
+        elif char == '*':
+            parts.append('[^/]*')
+            index += 1
+        elif char == '?':
+            parts.append('[^/]')
+            index += 1
+        elif char == '[':
+            end = pattern.find(']', index + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+                index += 1
+            else:
+                body = pattern[index + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                index = end + 1
+        elif char == '\\' and index + 1 < length:
+            parts.append(re.escape(pattern[index + 1]))
+            index += 2
+        else:
+            parts.append(re.escape(char))
+            index += 1
+
+    return ''.join(parts)
+
+
+class IgnoreRule:
+    """A single line of a .gitignore file."""
+
+    __slots__ = ('base', 'regex', 'negate', 'dir_only', 'basename_only')
+
+    def __init__(self, base: str, line: str):
+        """
+        Parse a rule.
+
+        Args:
+            base: Directory of the ignore file relative to the walk root ('' for the root)
+            line: Rule text (already stripped of comments and blank lines)
+        """
+        self.base = base
+        self.negate = line.startswith('!')
+        if self.negate:
+            line = line[1:]
+        self.dir_only = line.endswith('/')
+        line = line.rstrip('/')
+
+        # Patterns without a slash match the name at any depth
+        self.basename_only = '/' not in line
+        line = line.lstrip('/')
+        self.regex = re.compile(_glob_to_regex(line) + r'\Z', re.DOTALL)
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Check whether the rule matches a path relative to the walk root."""
+        if self.dir_only and not is_dir:
+            return False
+
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+
+        if self.basename_only:
+            rel_path = rel_path.rsplit('/', 1)[-1]
+
+        return self.regex.match(rel_path) is not None
+
+
+def read_ignore_file(path: Path, base: str) -> List[IgnoreRule]:
+    """Read the rules of a .gitignore style file (missing files have no rules)."""
+    try:
+        lines = path.read_text(encoding='utf-8', errors='replace').splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        # Trailing spaces are ignored unless escaped
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        rules.append(IgnoreRule(base, line))
+    return rules
+
+
+def is_ignored(rules: Tuple[IgnoreRule, ...], rel_path: str, is_dir: bool) -> bool:
+    """Apply ignore rules in order; the last matching rule decides."""
+    ignored = False
+    for rule in rules:
+        if rule.negate == ignored and rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def walk_repository(
+    root: Path,
+    exclude_dirs: Optional[Set[str]] = None,
+    use_gitignore: bool = True,
+) -> Iterator[FileEntry]:
+    """Yield every file below root.
+
+    Each directory lists its files first, then its subdirectories, both in
+    name order.
+
+    Excluded and ignored directories are pruned before they are descended
+    into. Directory symlinks are not followed.
+
+    Args:
+        root: Directory to walk
+        exclude_dirs: Directory names to skip at any depth (default: DEFAULT_EXCLUDE_DIRS)
+        use_gitignore: Honour .gitignore files and .git/info/exclude
+
+    Yields:
+        FileEntry for each regular file (or symlink to one)
+    """
+    if exclude_dirs is None:
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+
+    rules: Tuple[IgnoreRule, ...] = ()
+    if use_gitignore:
+        rules = tuple(read_ignore_file(root / '.git' / 'info' / 'exclude', ''))
+
+    # Stack of (directory, path relative to root, rules in effect)
+    stack: List[Tuple[Path, str, Tuple[IgnoreRule, ...]]] = [(root, '', rules)]
+
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+
+        try:
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        if use_gitignore and any(entry.name == '.gitignore' for entry in entries):
+            rules = rules + tuple(read_ignore_file(directory / '.gitignore', rel_dir))
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+
+            if is_dir:
+                if entry.name in exclude_dirs:
+                    continue
+                if rules and is_ignored(rules, rel_path, True):
+                    continue
+                subdirs.append((directory / entry.name, rel_path, rules))
+            elif is_file:
+                if rules and is_ignored(rules, rel_path, False):
+                    continue
+                yield FileEntry(directory / entry.name, rel_path, entry)
+
+        # Reversed so the first subdirectory is walked next
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+
+This file is part of a Moko Consulting project.
+
+SPDX-License-Identifier: GPL-3.0-or-later
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+FILE INFORMATION
+DEFGROUP: MokoStandards.Scripts
+INGROUP: MokoStandards.Validation
+REPO: https://github.com/mokoconsulting-tech/MokoStandards
+PATH: /scripts/maintenance/benchmark_header_patterns.py
+VERSION: 05.00.00
+BRIEF: Micro-benchmark of header pattern matching strategies
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from validate_file_headers import (
+    GENERATED_PATTERNS,
+    GENERATED_WINDOW,
+    HEADER_WINDOW,
+    REQUIRED_FILE_INFO_PATTERNS,
+    REQUIRED_HEADER_PATTERNS,
+    PatternMatcher,
+)
+
+
+def legacy_check(content: str, generated: List[str], required: List[str]) -> List[str]:
+    """Original implementation: one substring search per pattern and check."""
+    if any(pattern in content[:GENERATED_WINDOW] for pattern in generated):
+        return []
+    first_section = content[:HEADER_WINDOW]
+    return [pattern for pattern in required if pattern not in first_section]
+
+
+def matcher_check(content: str, matcher: PatternMatcher, generated: List[str], required: List[str]) -> List[str]:
+    """Single scan of the header window, then dictionary lookups."""
+    hits = matcher.scan(content[:HEADER_WINDOW])
+    if any(pattern in hits and hits[pattern] + len(pattern) <= GENERATED_WINDOW for pattern in generated):
+        return []
+    return [pattern for pattern in required if pattern not in hits]
+
+
+def time_call(func: Callable[[], object], number: int) -> float:
+    """Return the mean time of func in microseconds."""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def run(sample: str, extra_counts: List[int], number: int) -> None:
+    """Benchmark each strategy for growing pattern sets."""
+    print(f"{'patterns':>8}  {'legacy':>10}  {'find':>10}  {'regex':>10}   (us per file)")
+
+    for extra in extra_counts:
+        generated = list(GENERATED_PATTERNS)
+        required = REQUIRED_HEADER_PATTERNS + REQUIRED_FILE_INFO_PATTERNS + [
+            f"FIELD{index:03d}:" for index in range(extra)
+        ]
+        patterns = generated + required
+
+        find_matcher = PatternMatcher(patterns, use_regex=False)
+        regex_matcher = PatternMatcher(patterns, use_regex=True)
+
+        expected = legacy_check(sample, generated, required)
+        for matcher in (find_matcher, regex_matcher):
+            assert matcher_check(sample, matcher, generated, required) == expected
+
+        timings: Dict[str, float] = {
+            'legacy': time_call(lambda: legacy_check(sample, generated, required), number),
+            'find': time_call(lambda: matcher_check(sample, find_matcher, generated, required), number),
+            'regex': time_call(lambda: matcher_check(sample, regex_matcher, generated, required), number),
+        }
+        print(f"{len(patterns):>8}  {timings['legacy']:>10.2f}  {timings['find']:>10.2f}  {timings['regex']:>10.2f}")
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Compare header pattern matching strategies'
+    )
+    parser.add_argument(
+        '--sample',
+        type=Path,
+        default=Path(__file__),
+        help='File whose header is used as input (default: this script)'
+    )
+    parser.add_argument(
+        '--number',
+        type=int,
+        default=5000,
+        help='Iterations per measurement (default: 5000)'
+    )
+    parser.add_argument(
+        '--extra',
+        type=int,
+        nargs='+',
+        default=[0, 25, 50, 100, 200],
+        help='Numbers of synthetic extra patterns to add (default: 0 25 50 100 200)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        sample = args.sample.read_text(encoding='utf-8')[:HEADER_WINDOW * 2]
+    except OSError as e:
+        print(f"Error: cannot read sample: {e}", file=sys.stderr)
+        return 1
+
+    run(sample, args.extra, args.number)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,6 +29,7 @@ NOTE: Updates CHANGELOG.md and optionally updates VERSION in files
 import argparse
 import json
 import re
+import sqlite3
 import subprocess
 import sys
 from datetime import datetime
@@ -43,6 +44,7 @@ class VersionReleaser:
     VERSION_PATTERN = r"## \[(\d+\.\d+\.\d+)\]"
     VERSION_HEADER_PATTERN = r"VERSION:\s*(\d+\.\d+\.\d+)"
     CHANGELOG_H1_PATTERN = r"^# CHANGELOG - .+ \(VERSION: (\d+\.\d+\.\d+)\)"  # H1 format
+    VERSION_FILE_SUFFIXES = (".md", ".py", ".txt", ".yml", ".yaml")
 
     def __init__(self, changelog_path: Path, repo_root: Path):
         """
@@ -191,32 +193,30 @@ class VersionReleaser:
                     return True
         return False
 
-    def update_file_versions(self, version: str, dry_run: bool = False) -> List[Path]:
+    def update_file_versions(
+        self, version: str, dry_run: bool = False, header_index: Optional[Path] = None
+    ) -> List[Path]:
         """
         Update VERSION in all files in the repository.
 
         Args:
             version: New version number
             dry_run: If True, don't actually update files
+            header_index: Header index written by validate_file_headers.py
+                --header-index; when given, only the files it lists with a
+                VERSION field are checked instead of scanning the tree
 
         Returns:
             List of files that were (or would be) updated
         """
         updated_files = []
 
-        # Find all markdown, Python, and text files
-        patterns = ["**/*.md", "**/*.py", "**/*.txt", "**/*.yml", "**/*.yaml"]
-        files_to_check = []
-
-        for pattern in patterns:
-            files_to_check.extend(self.repo_root.glob(pattern))
+        if header_index is not None:
+            files_to_check = self.indexed_version_files(header_index)
+        else:
+            files_to_check = self.find_version_files()
 
         for file_path in files_to_check:
-            # Skip certain directories
-            skip_dirs = [".git", "node_modules", "vendor", "__pycache__", ".venv"]
-            if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-                continue
-
             try:
                 with open(file_path, "r", encoding="utf-8") as f:
                     content = f.read()
@@ -235,8 +235,8 @@ class VersionReleaser:
                                 f.write(new_content)
                         updated_files.append(file_path.relative_to(self.repo_root))
 
-            except (UnicodeDecodeError, PermissionError):
-                # Skip binary files or files we can't read
+            except (UnicodeDecodeError, PermissionError, FileNotFoundError):
+                # Skip binary files, files we can't read and stale index entries
                 continue
             except Exception as e:
                 print(f"Warning: Error processing {file_path}: {e}", file=sys.stderr)
@@ -244,6 +244,55 @@ class VersionReleaser:
 
         return updated_files
 
+    def find_version_files(self) -> List[Path]:
+        """Find all files whose type may carry a VERSION header."""
+        files_to_check = []
+
+        for suffix in self.VERSION_FILE_SUFFIXES:
+            files_to_check.extend(self.repo_root.glob(f"**/*{suffix}"))
+
+        # Skip certain directories
+        skip_dirs = [".git", "node_modules", "vendor", "__pycache__", ".venv"]
+        return [
+            file_path for file_path in files_to_check
+            if not any(skip_dir in file_path.parts for skip_dir in skip_dirs)
+        ]
+
+    def indexed_version_files(self, header_index: Path) -> List[Path]:
+        """
+        List the files a header index records with a VERSION field.
+
+        The index only covers files validate_file_headers.py reads, so files
+        it skipped by classification are added, and suffixes it does not
+        validate at all (such as .txt) are still scanned.
+
+        Raises:
+            FileNotFoundError: If the index does not exist
+            sqlite3.Error: If the index cannot be read
+        """
+        from validate_file_headers import HEADER_REQUIRED_EXTENSIONS, HeaderIndex
+
+        if not header_index.is_file():
+            raise FileNotFoundError(f"Header index not found: {header_index}")
+
+        index = HeaderIndex(header_index, self.repo_root)
+        try:
+            indexed = [path for path, _, _, _ in index.query("VERSION")]
+            indexed.extend(index.skipped_paths())
+        finally:
+            index.close()
+
+        files_to_check = [
+            self.repo_root / path
+            for path in indexed
+            if Path(path).suffix in self.VERSION_FILE_SUFFIXES
+        ]
+        files_to_check.extend(
+            file_path for file_path in self.find_version_files()
+            if file_path.suffix not in HEADER_REQUIRED_EXTENSIONS
+        )
+        return files_to_check
+
     def extract_release_notes(self, version: str) -> Optional[str]:
         """
         Extract release notes for a specific version from CHANGELOG.
@@ -377,6 +426,14 @@ Version format: XX.YY.ZZ (e.g., 05.01.00)
         help="Update VERSION header in all repository files"
     )
 
+    parser.add_argument(
+        "--header-index",
+        type=Path,
+        metavar="DB",
+        help="With --update-files, use a header index from validate_file_headers.py"
+             " --header-index instead of scanning the repository"
+    )
+
     parser.add_argument(
         "--create-release",
         action="store_true",
@@ -426,7 +483,13 @@ Version format: XX.YY.ZZ (e.g., 05.01.00)
 
     # Update file versions if requested
     if args.update_files:
-        updated_files = releaser.update_file_versions(args.version, args.dry_run)
+        try:
+            updated_files = releaser.update_file_versions(
+                args.version, args.dry_run, args.header_index
+            )
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error reading header index: {e}", file=sys.stderr)
+            return 1
 
         if updated_files:
             if args.dry_run:
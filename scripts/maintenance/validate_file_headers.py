@@ -28,10 +28,32 @@ VERSION: 05.00.00
 BRIEF: Validate copyright headers and file information in repository files
 """
 
+import ast
+import codecs
+import difflib
+import hashlib
+import io
+import json
 import os
+import re
+import sqlite3
+import subprocess
 import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lib'))
+
+from build_variants import is_build_variant  # noqa: E402
+from repo_walker import DEFAULT_EXCLUDE_DIRS, FileEntry, walk_repository  # noqa: E402
 
 # File extensions that require headers
 HEADER_REQUIRED_EXTENSIONS = {
@@ -90,6 +112,135 @@ REQUIRED_MARKDOWN_METADATA = [
     '## Revision History',
 ]
 
+# Comment syntax used for headers written by --fix, per language
+HEADER_COMMENT_STYLES = {
+    'python': 'docstring',
+    'php': 'block',
+    'markdown': 'html',
+    'yaml': 'hash',
+    'shell': 'hash',
+    'javascript': 'block',
+    'typescript': 'block',
+    'css': 'block',
+}
+
+# Licence text written by --fix; {year} is replaced with the current year
+HEADER_TEMPLATE = [
+    'Copyright (C) {year} Moko Consulting <hello@mokoconsulting.tech>',
+    '',
+    'This file is part of a Moko Consulting project.',
+    '',
+    'SPDX-License-Identifier: GPL-3.0-or-later',
+    '',
+    'This program is free software; you can redistribute it and/or modify',
+    'it under the terms of the GNU General Public License as published by',
+    'the Free Software Foundation; either version 3 of the License, or',
+    '(at your option) any later version.',
+    '',
+    'This program is distributed in the hope that it will be useful,',
+    'but WITHOUT ANY WARRANTY; without even the implied warranty of',
+    'MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the',
+    'GNU General Public License for more details.',
+    '',
+    'You should have received a copy of the GNU General Public License',
+    'along with this program. If not, see <https://www.gnu.org/licenses/>.',
+]
+
+# FILE INFORMATION fields written by --fix, in order; INGROUP is optional
+FILE_INFO_FIELDS = ['DEFGROUP', 'INGROUP', 'REPO', 'PATH', 'VERSION', 'BRIEF']
+
+# A FILE INFORMATION field line, after any comment leader
+FILE_INFO_LINE = re.compile(
+    r'[ \t]*(?:#|\*|//)?[ \t]*(?P<field>[A-Z][A-Z_]*):[ \t]*(?P<value>.*?)[ \t]*$'
+)
+
+# Comment terminators that end a FILE INFORMATION block
+FILE_INFO_TERMINATOR = re.compile(r'\*/|-->|"""|\'\'\'')
+
+# FILE INFORMATION fields --fix must have a value for (PATH is derived)
+FIX_REQUIRED_FIELDS = ['DEFGROUP', 'REPO', 'VERSION', 'BRIEF']
+
+# Version numbers accepted from existing headers and CHANGELOG.md
+VERSION_VALUE = re.compile(r'\d+(?:\.\d+)+')
+
+# Released versions in CHANGELOG.md, newest first ("## [03.06.03] - ...")
+CHANGELOG_VERSION = re.compile(r'^## \[(\d+(?:\.\d+)+)\]', re.MULTILINE)
+
+# Number of chunks handed to each worker when running in parallel; more
+# chunks than workers keeps the pool busy when file sizes are uneven
+CHUNKS_PER_JOB = 4
+
+# Number of characters at the top of a file searched for header patterns
+HEADER_WINDOW = 2000
+
+# Number of characters at the top of a file searched for generated markers
+GENERATED_WINDOW = 1000
+
+# Below this many patterns one str.find per pattern beats a combined regex
+# (see benchmark_header_patterns.py)
+REGEX_MIN_PATTERNS = 50
+
+# Block size used when reading file content
+READ_BLOCK_SIZE = 64 * 1024
+
+# Size of the first block, used to classify a file before decoding it
+SNIFF_SIZE = 4096
+
+# Files larger than this are classified as oversized
+MAX_FILE_SIZE = 1024 * 1024
+
+# Lines at least this long are minified; a file is minified when most lines
+# of its first block are
+MINIFIED_LINE_LENGTH = 500
+
+# Header markers whose presence in the first block rules out minification
+HEADER_MARKERS = [pattern.encode('utf-8') for pattern in REQUIRED_HEADER_PATTERNS + ['FILE INFORMATION']]
+
+# What to do with each class of file that cannot carry a hand-written header:
+# 'skip' silently, 'warn' (not validated, but reported) or 'validate' anyway
+POLICY_ACTIONS = ('skip', 'warn', 'validate')
+
+# Bump when validate_file changes in a way that invalidates cached results
+CACHE_SCHEMA_VERSION = 4
+
+# Maximum number of cached file results kept; least recently used are evicted
+CACHE_MAX_ENTRIES = 500000
+
+# Maximum number of paths per cache query (SQLite variable limit)
+CACHE_QUERY_SIZE = 500
+
+# Number of files validated per batch; results are streamed batch by batch
+BATCH_SIZE = 2048
+
+# Default location of the result cache
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'mokostudios' / 'header_validation' / 'cache.sqlite3'
+
+
+@dataclass(frozen=True)
+class ClassificationPolicy:
+    """How binary, oversized and minified files are handled."""
+
+    binary: str = 'skip'
+    oversized: str = 'warn'
+    minified: str = 'warn'
+    max_size: int = MAX_FILE_SIZE
+    max_line_length: int = MINIFIED_LINE_LENGTH
+
+    def action(self, classification: str) -> str:
+        """Return the action ('skip', 'warn' or 'validate') for a classification."""
+        return getattr(self, classification)
+
+    def describe(self, classification: str) -> str:
+        """Describe why a file was given a classification."""
+        if classification == 'binary':
+            return 'binary content (NUL byte in first block)'
+        if classification == 'oversized':
+            return f'larger than {self.max_size} bytes'
+        return 'minified content'
+
+
+DEFAULT_POLICY = ClassificationPolicy()
+
 
 def is_exempt_file(filepath: Path) -> bool:
     """Check if file is exempt from header requirements."""
@@ -107,55 +258,323 @@ def is_exempt_file(filepath: Path) -> bool:
     return False
 
 
-def is_generated_file(content: str) -> bool:
+class PatternMatcher:
+    """Find the first occurrence of each of a set of literal patterns.
+
+    With many patterns the set is compiled into one alternation regex, longest
+    pattern first, and the text is scanned once. Shorter patterns matching at
+    the same position are prefixes of the reported one and are derived from
+    it, so the result is the same as searching for each pattern separately.
+    """
+
+    def __init__(self, patterns: Iterable[str], use_regex: Optional[bool] = None):
+        """
+        Compile the pattern set.
+
+        Args:
+            patterns: Literal strings to search for
+            use_regex: Force the combined regex on or off (default: based on
+                the number of patterns, see REGEX_MIN_PATTERNS)
+        """
+        self.patterns = list(dict.fromkeys(patterns))
+        if use_regex is None:
+            use_regex = len(self.patterns) >= REGEX_MIN_PATTERNS
+        self.use_regex = use_regex
+        self.prefixes = {
+            pattern: [other for other in self.patterns if other != pattern and pattern.startswith(other)]
+            for pattern in self.patterns
+        }
+        self.regex = re.compile('|'.join(
+            re.escape(pattern) for pattern in sorted(self.patterns, key=len, reverse=True)
+        ))
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Return the index of the first occurrence of each pattern found in text."""
+        hits: Dict[str, int] = {}
+
+        if not self.use_regex:
+            for pattern in self.patterns:
+                index = text.find(pattern)
+                if index >= 0:
+                    hits[pattern] = index
+            return hits
+
+        search = self.regex.search
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            for pattern in (match.group(), *self.prefixes[match.group()]):
+                if pattern not in hits:
+                    hits[pattern] = start
+            # Resume right after the match start so overlapping patterns are seen
+            match = search(text, start + 1)
+
+        return hits
+
+
+@lru_cache(maxsize=4)
+def _compile_matcher(patterns: Tuple[str, ...]) -> PatternMatcher:
+    return PatternMatcher(patterns)
+
+
+def scan_header(content: str) -> Dict[str, int]:
+    """Find generated markers, header and file info patterns in the header window."""
+    matcher = _compile_matcher(
+        tuple(GENERATED_PATTERNS + REQUIRED_HEADER_PATTERNS + REQUIRED_FILE_INFO_PATTERNS)
+    )
+    return matcher.scan(content[:HEADER_WINDOW])
+
+
+def is_generated_file(content: str, hits: Optional[Dict[str, int]] = None) -> bool:
     """Check if file appears to be auto-generated."""
-    first_lines = content[:1000]
-    return any(pattern in first_lines for pattern in GENERATED_PATTERNS)
+    if hits is None:
+        hits = scan_header(content)
+    return any(
+        pattern in hits and hits[pattern] + len(pattern) <= GENERATED_WINDOW
+        for pattern in GENERATED_PATTERNS
+    )
 
 
-def check_copyright_header(content: str, filepath: Path) -> Tuple[bool, List[str]]:
+def check_copyright_header(
+    content: str, filepath: Path, hits: Optional[Dict[str, int]] = None
+) -> Tuple[bool, List[str]]:
     """Check if file has proper copyright header."""
+    if hits is None:
+        hits = scan_header(content)
     issues = []
-    first_section = content[:2000]
 
     for pattern in REQUIRED_HEADER_PATTERNS:
-        if pattern not in first_section:
+        if pattern not in hits:
             issues.append(f"Missing required pattern: {pattern}")
 
     return len(issues) == 0, issues
 
 
-def check_file_information(content: str, filepath: Path) -> Tuple[bool, List[str]]:
+def check_file_information(
+    content: str, filepath: Path, hits: Optional[Dict[str, int]] = None
+) -> Tuple[bool, List[str]]:
     """Check if file has proper file information block."""
+    if hits is None:
+        hits = scan_header(content)
     issues = []
-    first_section = content[:2000]
 
     for pattern in REQUIRED_FILE_INFO_PATTERNS:
-        if pattern not in first_section:
+        if pattern not in hits:
             issues.append(f"Missing required file info: {pattern}")
 
     return len(issues) == 0, issues
 
 
-def check_markdown_metadata(content: str, filepath: Path) -> Tuple[bool, List[str]]:
-    """Check if markdown file has metadata and revision history."""
+def check_markdown_metadata(
+    content: str, filepath: Path, found_sections: Optional[Set[str]] = None
+) -> Tuple[bool, List[str]]:
+    """Check if markdown file has metadata and revision history.
+
+    When found_sections is given (see find_markdown_sections) it is used
+    instead of searching content.
+    """
     issues = []
 
     for pattern in REQUIRED_MARKDOWN_METADATA:
-        if pattern not in content:
+        if found_sections is not None:
+            present = pattern in found_sections
+        else:
+            present = pattern in content
+        if not present:
             issues.append(f"Missing required section: {pattern}")
 
     return len(issues) == 0, issues
 
 
-def validate_file(filepath: Path) -> Dict[str, any]:
-    """Validate a single file."""
+def parse_file_information(content: str) -> Optional[Dict[str, any]]:
+    """Extract the FILE INFORMATION block of a header into a structured record.
+
+    The block is the run of ``FIELD: value`` lines following the FILE
+    INFORMATION line. Comment leaders (``#``, ``*``, ``//``) are stripped and
+    the block ends at a comment terminator (``*/``, ``-->``, docstring quotes),
+    a blank line after the first field, or any other line.
+
+    Returns:
+        None if there is no FILE INFORMATION line in the header window,
+        otherwise a dict with the block's 1-based 'line', its character
+        'offset' and 'fields', mapping each field name to its 'value', 'line'
+        and the character 'offset' of the value
+    """
+    window = content[:HEADER_WINDOW]
+    start = window.find('FILE INFORMATION')
+    if start == -1:
+        return None
+
+    line_number = window.count('\n', 0, start) + 1
+    record = {'line': line_number, 'offset': start, 'fields': {}}
+    fields = record['fields']
+
+    offset = window.find('\n', start) + 1
+    while 0 < offset < len(window):
+        end = window.find('\n', offset)
+        if end == -1:
+            end = len(window)
+        line_number += 1
+        line = window[offset:end].rstrip('\r')
+
+        closer = FILE_INFO_TERMINATOR.search(line)
+        if closer:
+            line = line[:closer.start()]
+
+        match = FILE_INFO_LINE.match(line)
+        if match:
+            fields.setdefault(match.group('field'), {
+                'value': match.group('value'),
+                'line': line_number,
+                'offset': offset + match.start('value'),
+            })
+        elif fields or line.strip(' \t#*/'):
+            break
+
+        if closer:
+            break
+        offset = end + 1
+
+    return record
+
+
+def read_header_window(f: BinaryIO, first_block: bytes = b'') -> Tuple[str, bytes]:
+    """Read just enough of a binary file to cover the header window.
+
+    first_block holds bytes already read from the start of the file.
+    Returns the decoded text and the raw bytes read. Invalid UTF-8 in the
+    window raises UnicodeDecodeError like a full read would.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    raw = first_block
+    text = decoder.decode(first_block)
+    exhausted = False
+
+    while len(text) < HEADER_WINDOW and not exhausted:
+        block = f.read(READ_BLOCK_SIZE if raw else SNIFF_SIZE)
+        exhausted = not block
+        raw += block
+        text += decoder.decode(block, final=exhausted)
+
+    return text, raw
+
+
+def classify_by_metadata(filepath: Path, size: int, policy: ClassificationPolicy) -> Iterator[str]:
+    """Classify a file from its name and size, without reading it."""
+    if '.min.' in filepath.name:
+        yield 'minified'
+    if size > policy.max_size:
+        yield 'oversized'
+
+
+def is_minified(first_block: bytes, policy: ClassificationPolicy) -> bool:
+    """Check whether most lines of the first block are minified-length.
+
+    A hand-written file with a few long lines (inlined data, a long
+    string) is not minified, and neither is any file that carries our
+    header in the first block.
+    """
+    if not first_block or any(marker in first_block for marker in HEADER_MARKERS):
+        return False
+    lines = first_block.split(b'\n')
+    long_lines = sum(1 for line in lines if len(line) >= policy.max_line_length)
+    return long_lines * 2 > len(lines)
+
+
+def classify_by_content(first_block: bytes, policy: ClassificationPolicy) -> Iterator[str]:
+    """Classify a file from the first block of its content."""
+    if b'\0' in first_block:
+        yield 'binary'
+    elif is_minified(first_block, policy):
+        yield 'minified'
+
+
+def apply_policy(result: Dict[str, any], classification: str, policy: ClassificationPolicy) -> bool:
+    """Record a classification on result.
+
+    Returns:
+        True if the file should not be validated
+    """
+    action = policy.action(classification)
+    if action == 'validate':
+        return False
+
+    result['skipped'] = True
+    result['classification'] = classification
+    if action == 'warn':
+        result['warnings'].append(f"Not validated: {policy.describe(classification)}")
+    return True
+
+
+def find_markdown_sections(
+    f: BinaryIO, size: int, head: bytes, digest: Optional[Any] = None
+) -> Tuple[Set[str], int]:
+    """Search a markdown file for the required sections, reading from the tail.
+
+    Metadata and revision history live at the end of our documents, so the
+    file is scanned backwards in blocks and the scan stops once every section
+    has been found. The already-read head of the file is not read again.
+    Blocks read are fed to digest, if given.
+
+    Returns the set of sections found and the number of extra bytes read.
+    """
+    patterns = {pattern: pattern.encode('utf-8') for pattern in REQUIRED_MARKDOWN_METADATA}
+    overlap = max(len(encoded) for encoded in patterns.values()) - 1
+    found: Set[str] = set()
+    bytes_read = 0
+
+    def search(data: bytes) -> None:
+        for pattern, encoded in patterns.items():
+            if pattern not in found and encoded in data:
+                found.add(pattern)
+
+    position = size
+    carry = b''
+    while position > len(head) and len(found) < len(patterns):
+        start = max(len(head), position - READ_BLOCK_SIZE)
+        f.seek(start)
+        block = f.read(position - start)
+        bytes_read += len(block)
+        if digest is not None:
+            digest.update(block)
+        search(block + carry)
+        carry = block[:overlap]
+        position = start
+
+    if len(found) < len(patterns):
+        search(head + carry)
+
+    return found, bytes_read
+
+
+def validate_file(
+    filepath: Path,
+    data: Optional[bytes] = None,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+    digest: Optional[Any] = None,
+) -> Dict[str, any]:
+    """Validate a single file.
+
+    If data is given it is validated as the file content instead of reading
+    filepath (used for blobs read from the git index). Binary, oversized and
+    minified files are handled according to policy before any content check.
+    The parsed FILE INFORMATION block (see parse_file_information) is
+    returned under 'header'. If digest (a hashlib object) is given, it is
+    updated with every byte the validation reads, so the result can be
+    cached without reading the file again; files classified from their
+    name and size alone add nothing to it.
+    """
     result = {
         'path': str(filepath),
         'valid': True,
         'issues': [],
+        'warnings': [],
         'exempt': False,
         'generated': False,
+        'skipped': False,
+        'classification': None,
+        'bytes_read': 0,
+        'header': None,
     }
 
     # Check if exempt
@@ -168,35 +587,62 @@ def validate_file(filepath: Path) -> Dict[str, any]:
         result['exempt'] = True
         return result
 
-    # Read file content
+    # Read the header window (and, for markdown, search for the sections)
+    found_sections = None
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with (io.BytesIO(data) if data is not None else open(filepath, 'rb')) as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            for classification in classify_by_metadata(filepath, size, policy):
+                if apply_policy(result, classification, policy):
+                    return result
+
+            first_block = f.read(SNIFF_SIZE)
+            result['bytes_read'] = len(first_block)
+            for classification in classify_by_content(first_block, policy):
+                if apply_policy(result, classification, policy):
+                    if digest is not None:
+                        digest.update(first_block)
+                    return result
+
+            content, head = read_header_window(f, first_block)
+            result['bytes_read'] = len(head)
+            if digest is not None:
+                digest.update(head)
+
+            if filepath.suffix == '.md':
+                found_sections, tail_bytes = find_markdown_sections(f, size, head, digest)
+                result['bytes_read'] += tail_bytes
     except Exception as e:
         result['valid'] = False
         result['issues'].append(f"Error reading file: {e}")
         return result
 
+    # Find all header patterns in one pass
+    hits = scan_header(content)
+    if 'FILE INFORMATION' in hits:
+        result['header'] = parse_file_information(content)
+
     # Check if generated
-    if is_generated_file(content):
+    if is_generated_file(content, hits):
         result['generated'] = True
         return result
 
     # Check copyright header
-    valid, issues = check_copyright_header(content, filepath)
+    valid, issues = check_copyright_header(content, filepath, hits)
     if not valid:
         result['valid'] = False
         result['issues'].extend(issues)
 
     # Check file information
-    valid, issues = check_file_information(content, filepath)
+    valid, issues = check_file_information(content, filepath, hits)
     if not valid:
         result['valid'] = False
         result['issues'].extend(issues)
 
     # Additional checks for markdown files
     if filepath.suffix == '.md':
-        valid, issues = check_markdown_metadata(content, filepath)
+        valid, issues = check_markdown_metadata(content, filepath, found_sections)
         if not valid:
             result['valid'] = False
             result['issues'].extend(issues)
@@ -204,85 +650,1183 @@ def validate_file(filepath: Path) -> Dict[str, any]:
     return result
 
 
-def validate_repository(repo_path: Path) -> Dict[str, any]:
-    """Validate all files in repository."""
-    results = {
+def rules_digest(policy: ClassificationPolicy = DEFAULT_POLICY) -> str:
+    """Hash the active rule set so cached results are dropped when it changes."""
+    rules = {
+        'policy': asdict(policy),
+        'schema': CACHE_SCHEMA_VERSION,
+        'extensions': HEADER_REQUIRED_EXTENSIONS,
+        'exempt': sorted(EXEMPT_FILES),
+        'generated': GENERATED_PATTERNS,
+        'header': REQUIRED_HEADER_PATTERNS,
+        'file_info': REQUIRED_FILE_INFO_PATTERNS,
+        'markdown': REQUIRED_MARKDOWN_METADATA,
+        'window': HEADER_WINDOW,
+        'generated_window': GENERATED_WINDOW,
+    }
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class HeaderCache:
+    """SQLite cache of per-file validation results.
+
+    Entries are keyed on file path and rule set hash, and validated against
+    the file size and mtime. The stored digest hashes the bytes validation
+    read (see validate_file), which are all the result depends on; it is
+    computed from bytes already in memory, never by reading a file again.
+    When only the mtime changed (a fresh checkout, a touched file), the
+    worker pool re-reads the same bytes and confirm() compares their digest,
+    so unchanged content is still a hit and its mtime is refreshed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_CACHE_PATH,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        policy: ClassificationPolicy = DEFAULT_POLICY,
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_entries: Maximum number of entries kept after prune()
+            policy: Classification policy the cached results were produced with
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.rules = rules_digest(policy)
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' path TEXT NOT NULL, rules TEXT NOT NULL, size INTEGER NOT NULL,'
+            ' mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL, result TEXT NOT NULL,'
+            ' last_used INTEGER NOT NULL, PRIMARY KEY (path, rules))'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+
+        self.entries: Dict[str, Tuple] = {}
+        self.run_id = time.time_ns()
+        self.used: List[str] = []
+        self.pending: List[Tuple] = []
+
+    def prefetch(self, filepaths: Iterable[Path]) -> None:
+        """Load the entries for a batch of files, replacing the previous batch.
+
+        One query per batch is far cheaper than one per file, and memory use
+        stays bounded by the batch size.
+        """
+        self.entries = {}
+        paths = [str(filepath) for filepath in filepaths]
+        for start in range(0, len(paths), CACHE_QUERY_SIZE):
+            chunk = paths[start:start + CACHE_QUERY_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                'SELECT path, size, mtime_ns, digest, result FROM results'
+                f' WHERE rules = ? AND path IN ({placeholders})',
+                (self.rules, *chunk)
+            )
+            for path, size, mtime_ns, digest, result in rows:
+                self.entries[path] = (size, mtime_ns, digest, result)
+
+    def lookup(self, filepath: Path, stat: os.stat_result) -> Optional[Dict[str, any]]:
+        """Look up a cached result for a file (see prefetch()).
+
+        Returns:
+            Cached result, or None if the file is not cached or its size or
+            mtime changed (see confirm())
+        """
+        path = str(filepath)
+        entry = self.entries.get(path)
+        if entry is None or entry[:2] != (stat.st_size, stat.st_mtime_ns):
+            return None
+
+        self.hits += 1
+        self.used.append(path)
+        return json.loads(entry[3])
+
+    def confirm(self, filepath: Path, stat: os.stat_result, digest: str) -> Optional[Dict[str, any]]:
+        """Look up a cached result by the digest of the bytes validation read.
+
+        Called for files lookup() missed. On a match the entry is stored
+        again with the file's new mtime, so the next run hits in lookup().
+
+        Returns:
+            Cached result, or None if the file is not cached or its content
+            changed
+        """
+        entry = self.entries.get(str(filepath))
+        if entry is None or entry[0] != stat.st_size or entry[2] != digest:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        result = json.loads(entry[3])
+        self.store(filepath, stat, digest, result)
+        return result
+
+    def store(self, filepath: Path, stat: os.stat_result, digest: str, result: Dict[str, any]) -> None:
+        """Queue a validation result for storage (written by flush())."""
+        cached = dict(result, bytes_read=0)
+        self.pending.append((
+            str(filepath), self.rules, stat.st_size, stat.st_mtime_ns,
+            digest, json.dumps(cached), self.run_id
+        ))
+
+    def flush(self) -> None:
+        """Write queued entries and mark used entries."""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self.pending
+            )
+            self.conn.executemany(
+                'UPDATE results SET last_used = ? WHERE path = ? AND rules = ?',
+                ((self.run_id, path, self.rules) for path in self.used)
+            )
+        self.pending = []
+        self.used = []
+
+    def save(self) -> None:
+        """Write queued entries and evict old ones."""
+        self.flush()
+        with self.conn:
+            self.prune()
+
+    def prune(self) -> int:
+        """Evict least recently used entries above max_entries.
+
+        Returns:
+            Number of entries evicted
+        """
+        cursor = self.conn.execute(
+            'DELETE FROM results WHERE rowid IN ('
+            ' SELECT rowid FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+
+class HeaderIndex:
+    """SQLite index of parsed FILE INFORMATION blocks, keyed by repository path.
+
+    The index is filled from validation results, so it is built in the same
+    pass as validation. Paths are stored relative to the repository root with
+    '/' separators. Other tools query it instead of rescanning the tree.
+    Files skipped by classification (binary, oversized, minified) were never
+    read, so they are listed separately for tools that must not miss them.
+    """
+
+    def __init__(self, db_path: Path, repo_path: Path):
+        """
+        Open (or create) the index database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            repo_path: Repository root the indexed paths are relative to
+        """
+        self.db_path = db_path
+        self.repo_path = repo_path
+        self.run_id = time.time_ns()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS headers ('
+            ' path TEXT PRIMARY KEY, line INTEGER NOT NULL, offset INTEGER NOT NULL,'
+            ' run INTEGER NOT NULL)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS fields ('
+            ' path TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL,'
+            ' line INTEGER NOT NULL, offset INTEGER NOT NULL, PRIMARY KEY (path, field))'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS fields_field ON fields (field)')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS skipped (path TEXT PRIMARY KEY, run INTEGER NOT NULL)'
+        )
+
+    def relative_path(self, filepath: Path) -> str:
+        """Return the index key of a file."""
+        try:
+            return filepath.relative_to(self.repo_path).as_posix()
+        except ValueError:
+            return filepath.as_posix()
+
+    def add(self, result: Dict[str, any]) -> None:
+        """Record (or clear) the header of a validation result."""
+        path = self.relative_path(Path(result['path']))
+        self.conn.execute('DELETE FROM fields WHERE path = ?', (path,))
+        if result['skipped']:
+            self.conn.execute('INSERT OR REPLACE INTO skipped VALUES (?, ?)', (path, self.run_id))
+        else:
+            self.conn.execute('DELETE FROM skipped WHERE path = ?', (path,))
+        header = result.get('header')
+        if header is None:
+            self.conn.execute('DELETE FROM headers WHERE path = ?', (path,))
+            return
+
+        self.conn.execute(
+            'INSERT OR REPLACE INTO headers VALUES (?, ?, ?, ?)',
+            (path, header['line'], header['offset'], self.run_id)
+        )
+        self.conn.executemany(
+            'INSERT INTO fields VALUES (?, ?, ?, ?, ?)',
+            (
+                (path, field, entry['value'], entry['line'], entry['offset'])
+                for field, entry in header['fields'].items()
+            )
+        )
+
+    def commit(self, complete: bool = False) -> None:
+        """Commit the recorded headers.
+
+        Args:
+            complete: The whole tree was indexed; drop files not seen in this run
+        """
+        if complete:
+            self.conn.execute(
+                'DELETE FROM fields WHERE path IN (SELECT path FROM headers WHERE run != ?)',
+                (self.run_id,)
+            )
+            self.conn.execute('DELETE FROM headers WHERE run != ?', (self.run_id,))
+            self.conn.execute('DELETE FROM skipped WHERE run != ?', (self.run_id,))
+        self.conn.commit()
+
+    def query(self, field: str) -> Iterator[Tuple[str, str, int, int]]:
+        """Yield (path, value, line, offset) for every file that has field, by path."""
+        yield from self.conn.execute(
+            'SELECT path, value, line, offset FROM fields WHERE field = ? ORDER BY path',
+            (field,)
+        )
+
+    def skipped_paths(self) -> List[str]:
+        """Return the files skipped by classification, whose headers were never read."""
+        return [path for path, in self.conn.execute('SELECT path FROM skipped ORDER BY path')]
+
+    def fields(self, path: str) -> Dict[str, str]:
+        """Return the FILE INFORMATION values of one file (empty if not indexed)."""
+        rows = self.conn.execute('SELECT field, value FROM fields WHERE path = ?', (path,))
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+
+def run_git(repo_path: Path, *args: str, input: Optional[bytes] = None) -> bytes:
+    """Run a git command in repo_path and return its stdout."""
+    completed = subprocess.run(
+        ['git', '-C', str(repo_path), *args],
+        input=input,
+        capture_output=True,
+        check=True,
+    )
+    return completed.stdout
+
+
+def split_nul(output: bytes) -> List[str]:
+    """Split NUL-terminated git output into strings."""
+    return [item.decode('utf-8', 'surrogateescape') for item in output.split(b'\0') if item]
+
+
+def changed_files_since(repo_path: Path, ref: str) -> List[Path]:
+    """List files changed between the merge base of ref and HEAD and the work tree.
+
+    Paths are limited to repo_path. Deleted files are not included.
+    """
+    merge_base = run_git(repo_path, 'merge-base', ref, 'HEAD').decode('utf-8').strip()
+    output = run_git(
+        repo_path, 'diff', '--relative', '--name-only', '-z',
+        '--diff-filter=ACMRT', merge_base
+    )
+    return [repo_path / name for name in split_nul(output)]
+
+
+def staged_blobs(repo_path: Path) -> List[Tuple[Path, bytes]]:
+    """Read the staged content of every file added or modified in the index.
+
+    Blob content is read from the index through a single
+    ``git cat-file --batch`` process, so unstaged edits are never seen.
+    """
+    names = split_nul(run_git(
+        repo_path, 'diff', '--cached', '--relative', '--name-only', '-z',
+        '--diff-filter=ACMRT'
+    ))
+    if not names:
+        return []
+
+    # "<mode> <object> <stage>\t<path>" for each staged path
+    object_ids = {}
+    listing = run_git(repo_path, 'ls-files', '-s', '-z', '--', *names)
+    for entry in split_nul(listing):
+        info, name = entry.split('\t', 1)
+        object_ids[name] = info.split()[1]
+
+    names = [name for name in names if name in object_ids]
+    batch = run_git(
+        repo_path, 'cat-file', '--batch',
+        input=''.join(f"{object_ids[name]}\n" for name in names).encode('utf-8')
+    )
+
+    blobs = []
+    offset = 0
+    for name in names:
+        header_end = batch.index(b'\n', offset)
+        size = int(batch[offset:header_end].split()[2])
+        start = header_end + 1
+        blobs.append((repo_path / name, batch[start:start + size]))
+        # Content is followed by a newline
+        offset = start + size + 1
+
+    return blobs
+
+
+def iter_files(repo_path: Path, use_gitignore: bool = True) -> Iterator[FileEntry]:
+    """Iterate over all files in repository in walk order.
+
+    Excluded directories (.git, vendor, node_modules) and, optionally,
+    gitignored paths are pruned without being descended into.
+    """
+    return walk_repository(repo_path, DEFAULT_EXCLUDE_DIRS, use_gitignore)
+
+
+def iter_batches(entries: Iterable[FileEntry], size: int) -> Iterator[List[FileEntry]]:
+    """Group entries into lists of at most size items."""
+    iterator = iter(entries)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def chunk_by_size(files: List[FileEntry], chunk_count: int) -> List[List[Path]]:
+    """Split files into contiguous chunks of roughly equal total size.
+
+    Chunks keep the original file order so results can be merged back
+    by simply concatenating them.
+    """
+    sizes = []
+    for entry in files:
+        try:
+            sizes.append(entry.size)
+        except OSError:
+            sizes.append(0)
+
+    # Every file costs at least one block so empty files still get spread out
+    weights = [max(size, 4096) for size in sizes]
+    target = sum(weights) / max(chunk_count, 1)
+
+    chunks = []
+    current = []
+    current_weight = 0
+    for entry, weight in zip(files, weights):
+        current.append(entry.path)
+        current_weight += weight
+        if current_weight >= target:
+            chunks.append(current)
+            current = []
+            current_weight = 0
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def validate_chunk(
+    files: List[Path],
+    fingerprint: bool = False,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+) -> List:
+    """Validate a chunk of files (process pool worker).
+
+    With fingerprint set, each item is a (result, digest) tuple so the
+    result can be stored in the cache; the digest covers the bytes the
+    validation read.
+    """
+    if not fingerprint:
+        return [validate_file(filepath, policy=policy) for filepath in files]
+
+    items = []
+    for filepath in files:
+        digest = hashlib.blake2b(digest_size=20)
+        result = validate_file(filepath, policy=policy, digest=digest)
+        items.append((result, digest.hexdigest()))
+    return items
+
+
+def run_chunks(
+    files: List[FileEntry],
+    executor: Optional[ProcessPoolExecutor],
+    jobs: int,
+    fingerprint: bool = False,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+) -> List:
+    """Run validate_chunk over files, serially or in the process pool, in order."""
+    worker = partial(validate_chunk, fingerprint=fingerprint, policy=policy)
+
+    if executor is not None and len(files) > 1:
+        chunks = chunk_by_size(files, jobs * CHUNKS_PER_JOB)
+        return [
+            item
+            for chunk_items in executor.map(worker, chunks)
+            for item in chunk_items
+        ]
+
+    return worker([entry.path for entry in files])
+
+
+def needs_content(filepath: Path) -> bool:
+    """Check whether validating a file requires reading it."""
+    return not is_exempt_file(filepath) and filepath.suffix in HEADER_REQUIRED_EXTENSIONS
+
+
+def validate_batch(
+    files: List[FileEntry],
+    executor: Optional[ProcessPoolExecutor],
+    jobs: int,
+    cache: Optional[HeaderCache] = None,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+) -> List[Dict[str, any]]:
+    """Validate a batch of files, reusing cached results for unchanged files."""
+    if cache is None:
+        return run_chunks(files, executor, jobs, policy=policy)
+
+    file_results: List[Optional[Dict[str, any]]] = [None] * len(files)
+    misses = []
+
+    cache.prefetch(entry.path for entry in files if needs_content(entry.path))
+
+    for index, entry in enumerate(files):
+        if not needs_content(entry.path):
+            file_results[index] = validate_file(entry.path)
+            continue
+
+        try:
+            stat = entry.stat()
+        except OSError:
+            file_results[index] = validate_file(entry.path)
+            continue
+
+        cached = cache.lookup(entry.path, stat)
+        if cached is not None:
+            cached['path'] = str(entry.path)
+            file_results[index] = cached
+        else:
+            misses.append((index, entry))
+
+    items = run_chunks([entry for _, entry in misses], executor, jobs, fingerprint=True, policy=policy)
+    for (index, entry), (result, digest) in zip(misses, items):
+        file_results[index] = result
+        read_failed = any(issue.startswith('Error reading file') for issue in result['issues'])
+        if read_failed:
+            continue
+        cached = cache.confirm(entry.path, entry.stat(), digest)
+        if cached is not None:
+            file_results[index] = dict(cached, path=str(entry.path), bytes_read=result['bytes_read'])
+        else:
+            cache.store(entry.path, entry.stat(), digest, result)
+
+    cache.flush()
+    return file_results
+
+
+def iter_file_results(
+    entries: Iterable[FileEntry],
+    jobs: int = 1,
+    cache: Optional[HeaderCache] = None,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+) -> Iterator[Dict[str, any]]:
+    """Validate files and yield each result in walk order as soon as its batch is done.
+
+    With jobs > 1 each batch is validated in a process pool; results are
+    merged in walk order so the output is identical to a serial run. With a
+    cache, only files that changed since the last run are re-validated.
+    """
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        for batch in iter_batches(entries, BATCH_SIZE):
+            yield from validate_batch(batch, executor, jobs, cache, policy)
+        if cache is not None:
+            cache.save()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def git_error(error: Exception) -> str:
+    """Describe a failed git invocation."""
+    if isinstance(error, subprocess.CalledProcessError) and error.stderr:
+        return error.stderr.decode('utf-8', 'replace').strip()
+    return str(error)
+
+
+def is_reportable(result: Dict[str, any]) -> bool:
+    """Check whether a result is an invalid, validated file."""
+    return not result['valid'] and not result['exempt'] and not result['generated'] and not result['skipped']
+
+
+class ReportWriter:
+    """Base class for streaming report writers.
+
+    start() is called once before the first result, write() once per file
+    result as soon as it is produced, and finish() once with the counters.
+    """
+
+    def __init__(self, stream: TextIO, repo_path: Path, verbose: bool = False):
+        """
+        Create a writer.
+
+        Args:
+            stream: Text stream to write to
+            repo_path: Repository root the results belong to
+            verbose: Include valid files in the output
+        """
+        self.stream = stream
+        self.repo_path = repo_path
+        self.verbose = verbose
+
+    def start(self) -> None:
+        """Write the report preamble."""
+
+    def write(self, result: Dict[str, any]) -> None:
+        """Write a single file result."""
+
+    def finish(self, counters: Dict[str, int]) -> None:
+        """Write the summary and close the report."""
+
+
+class TextReportWriter(ReportWriter):
+    """Human readable report; issues are printed as files are validated."""
+
+    def start(self) -> None:
+        print("=" * 70, file=self.stream)
+        print("FILE HEADER VALIDATION REPORT", file=self.stream)
+        print("=" * 70, file=self.stream)
+
+    def write(self, result: Dict[str, any]) -> None:
+        if is_reportable(result):
+            print(f"\n{result['path']}", file=self.stream)
+            for issue in result['issues']:
+                print(f"  ✗ {issue}", file=self.stream)
+        elif result['warnings']:
+            print(f"\n{result['path']}", file=self.stream)
+            for warning in result['warnings']:
+                print(f"  ⚠ {warning}", file=self.stream)
+        elif self.verbose and result['valid']:
+            print(f"  ✓ {result['path']}", file=self.stream)
+        self.stream.flush()
+
+    def finish(self, counters: Dict[str, int]) -> None:
+        print(file=self.stream)
+        print("-" * 70, file=self.stream)
+        print(f"Total files found:     {counters['total']}", file=self.stream)
+        print(f"Files validated:       {counters['validated']}", file=self.stream)
+        print(f"Valid headers:         {counters['valid']}", file=self.stream)
+        print(f"Invalid headers:       {counters['invalid']}", file=self.stream)
+        print(f"Exempt files:          {counters['exempt']}", file=self.stream)
+        print(f"Generated files:       {counters['generated']}", file=self.stream)
+        print(f"Skipped files:         {counters['skipped']}", file=self.stream)
+        print(f"Warnings:              {counters['warnings']}", file=self.stream)
+        print(f"Bytes read:            {counters['bytes_read']}", file=self.stream)
+        print(file=self.stream)
+        print("=" * 70, file=self.stream)
+
+        if counters['invalid'] > 0:
+            validated = counters['validated']
+            compliance_rate = (counters['valid'] / validated * 100) if validated > 0 else 0
+            print(f"Compliance Rate: {compliance_rate:.1f}%", file=self.stream)
+            print(file=self.stream)
+            print("ACTION REQUIRED: Fix files with missing or invalid headers", file=self.stream)
+        else:
+            print("✓ All validated files have proper headers", file=self.stream)
+
+
+class JsonLinesWriter(ReportWriter):
+    """One JSON object per file result, followed by a summary record."""
+
+    def write(self, result: Dict[str, any]) -> None:
+        if self.verbose or is_reportable(result) or result['warnings']:
+            self.stream.write(json.dumps(result, ensure_ascii=False) + '\n')
+            self.stream.flush()
+
+    def finish(self, counters: Dict[str, int]) -> None:
+        self.stream.write(json.dumps({'summary': counters}) + '\n')
+
+
+# SARIF rule id for each issue message prefix
+SARIF_RULES = [
+    ('Missing required pattern: ', 'missing-header-pattern', 'Copyright header pattern is missing'),
+    ('Missing required file info: ', 'missing-file-info', 'FILE INFORMATION field is missing'),
+    ('Missing required section: ', 'missing-markdown-section', 'Markdown metadata section is missing'),
+    ('Error reading file', 'read-error', 'File could not be read'),
+    ('Not validated: ', 'not-validated', 'File was classified as binary, oversized or minified'),
+]
+
+
+class SarifWriter(ReportWriter):
+    """SARIF 2.1.0 log, written incrementally with one result per issue."""
+
+    def start(self) -> None:
+        driver = {
+            'name': 'validate_file_headers',
+            'informationUri': 'https://github.com/mokoconsulting-tech/MokoStandards',
+            'rules': [
+                {'id': rule_id, 'shortDescription': {'text': description}}
+                for _, rule_id, description in SARIF_RULES
+            ],
+        }
+        base = {'SRCROOT': {'uri': self.repo_path.as_uri() + '/'}}
+        self.stream.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", "runs": [{'
+            f'"tool": {{"driver": {json.dumps(driver)}}}, '
+            f'"originalUriBaseIds": {json.dumps(base)}, "results": [\n'
+        )
+        self.first = True
+
+    def write(self, result: Dict[str, any]) -> None:
+        messages = [('warning', warning) for warning in result['warnings']]
+        if is_reportable(result):
+            messages += [('error', issue) for issue in result['issues']]
+        if not messages:
+            return
+
+        try:
+            uri = Path(result['path']).relative_to(self.repo_path).as_posix()
+        except ValueError:
+            uri = Path(result['path']).as_posix()
+
+        for level, message in messages:
+            rule_id = next(
+                (rule_id for prefix, rule_id, _ in SARIF_RULES if message.startswith(prefix)),
+                'header'
+            )
+            record = {
+                'ruleId': rule_id,
+                'level': level,
+                'message': {'text': message},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': uri, 'uriBaseId': 'SRCROOT'},
+                        'region': {'startLine': 1},
+                    }
+                }],
+            }
+            self.stream.write(('' if self.first else ',\n') + json.dumps(record, ensure_ascii=False))
+            self.first = False
+        self.stream.flush()
+
+    def finish(self, counters: Dict[str, int]) -> None:
+        self.stream.write(f'\n], "properties": {{"summary": {json.dumps(counters)}}}}}]}}\n')
+
+
+REPORT_WRITERS = {
+    'text': TextReportWriter,
+    'jsonl': JsonLinesWriter,
+    'sarif': SarifWriter,
+}
+
+
+def new_counters() -> Dict[str, int]:
+    """Create zeroed report counters."""
+    return {
         'total': 0,
         'validated': 0,
         'valid': 0,
         'invalid': 0,
         'exempt': 0,
         'generated': 0,
-        'files': [],
+        'skipped': 0,
+        'warnings': 0,
+        'bytes_read': 0,
     }
 
-    # Find all tracked files
-    for filepath in repo_path.rglob('*'):
-        if not filepath.is_file():
-            continue
 
-        results['total'] += 1
+def run_validation(
+    file_results: Iterable[Dict[str, any]],
+    writer: Optional[ReportWriter] = None,
+) -> Dict[str, int]:
+    """Consume file results, streaming each to writer; only counters are kept."""
+    counters = new_counters()
 
-        result = validate_file(filepath)
-        results['files'].append(result)
+    if writer is not None:
+        writer.start()
+
+    for result in file_results:
+        counters['total'] += 1
+        counters['bytes_read'] += result['bytes_read']
+        counters['warnings'] += len(result['warnings'])
 
         if result['exempt']:
-            results['exempt'] += 1
+            counters['exempt'] += 1
+        elif result['skipped']:
+            counters['skipped'] += 1
         elif result['generated']:
-            results['generated'] += 1
+            counters['generated'] += 1
         else:
-            results['validated'] += 1
+            counters['validated'] += 1
             if result['valid']:
-                results['valid'] += 1
+                counters['valid'] += 1
             else:
-                results['invalid'] += 1
-
-    return results
-
-
-def print_report(results: Dict[str, any], verbose: bool = False):
-    """Print validation report."""
-    print("=" * 70)
-    print("FILE HEADER VALIDATION REPORT")
-    print("=" * 70)
-    print()
-    print(f"Total files found:     {results['total']}")
-    print(f"Files validated:       {results['validated']}")
-    print(f"Valid headers:         {results['valid']}")
-    print(f"Invalid headers:       {results['invalid']}")
-    print(f"Exempt files:          {results['exempt']}")
-    print(f"Generated files:       {results['generated']}")
-    print()
-
-    if results['invalid'] > 0:
-        print("FILES WITH ISSUES:")
-        print("-" * 70)
-        for file_result in results['files']:
-            if not file_result['valid'] and not file_result['exempt'] and not file_result['generated']:
-                print(f"\n{file_result['path']}")
-                for issue in file_result['issues']:
-                    print(f"  ✗ {issue}")
-        print()
+                counters['invalid'] += 1
+
+        if writer is not None:
+            writer.write(result)
+
+    if writer is not None:
+        writer.finish(counters)
+
+    return counters
+
+
+def validate_repository(
+    repo_path: Path,
+    jobs: int = 1,
+    cache: Optional[HeaderCache] = None,
+    files: Optional[List[Path]] = None,
+    use_gitignore: bool = True,
+    writer: Optional[ReportWriter] = None,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+) -> Dict[str, int]:
+    """Validate all files in repository.
+
+    Results are streamed to writer as they are produced; only the counters
+    are returned. If files is given, only those files are validated instead
+    of the whole tree.
+    """
+    if files is None:
+        entries = iter_files(repo_path, use_gitignore)
+    else:
+        entries = (FileEntry.from_path(filepath, repo_path) for filepath in files)
 
-    if verbose and results['valid'] > 0:
-        print("\nVALID FILES:")
-        print("-" * 70)
-        for file_result in results['files']:
-            if file_result['valid']:
-                print(f"  ✓ {file_result['path']}")
-        print()
+    return run_validation(iter_file_results(entries, jobs, cache, policy), writer)
 
-    print("=" * 70)
 
-    if results['invalid'] > 0:
-        compliance_rate = (results['valid'] / results['validated'] * 100) if results['validated'] > 0 else 0
-        print(f"Compliance Rate: {compliance_rate:.1f}%")
-        print()
-        print("ACTION REQUIRED: Fix files with missing or invalid headers")
-        return False
+def validate_staged(
+    repo_path: Path,
+    writer: Optional[ReportWriter] = None,
+    policy: ClassificationPolicy = DEFAULT_POLICY,
+) -> Dict[str, int]:
+    """Validate the staged (index) content of files added or modified in the index."""
+    file_results = (
+        validate_file(filepath, data, policy) for filepath, data in staged_blobs(repo_path)
+    )
+    return run_validation(file_results, writer)
+
+
+def render_comment(lines: List[str], style: str) -> List[str]:
+    """Wrap header lines in a comment of the given style."""
+    if style == 'hash':
+        return [f"# {line}" if line else '#' for line in lines]
+    if style == 'docstring':
+        return ['"""', *lines, '"""']
+    if style == 'html':
+        return ['<!--', *(f" {line}" if line else '' for line in lines), '-->']
+    return [f"/* {lines[0]}", *(f" {line}" if line else '' for line in lines[1:]), ' */']
+
+
+def file_info_lines(fields: Dict[str, str], missing: Iterable[str], prefix: str = '') -> List[str]:
+    """Build FILE INFORMATION field lines for the missing fields."""
+    missing = set(missing)
+    lines = []
+    for field in FILE_INFO_FIELDS:
+        if field not in missing:
+            continue
+        value = fields.get(field)
+        if value is None:
+            # Only INGROUP is optional; build_fixed_content checks the rest
+            continue
+        lines.append(f"{prefix}{field}: {value}")
+    return lines
+
+
+def header_insert_position(lines: List[str], style: str) -> int:
+    """Find the line a new header is inserted before.
+
+    Shebangs, encoding declarations, ``<?php`` openers, ``@charset`` rules and
+    YAML front matter must stay first.
+    """
+    index = 0
+    if lines and lines[0].startswith('#!'):
+        index = 1
+    if style == 'docstring' and index < len(lines) and re.match(r'#.*coding[:=]', lines[index]):
+        index += 1
+    if style == 'block' and index < len(lines) and (
+        lines[index].startswith('<?php') or lines[index].startswith('@charset')
+    ):
+        index += 1
+    if style == 'html' and lines and lines[0] == '---':
+        end = next((i for i, line in enumerate(lines[1:], 1) if line == '---'), None)
+        if end is not None:
+            index = end + 1
+    return index
+
+
+def line_prefix(line: str) -> str:
+    """Return the comment leader of a header line (indentation plus '#', '*' or '//')."""
+    if line.lstrip().startswith(('/*', '<!--')):
+        return ' '
+    return re.match(r'\s*(?:(?:#|\*|//)\s?)?', line).group(0)
+
+
+def starts_docstring(lines: List[str], position: int) -> bool:
+    """Check whether a module docstring starts at a line."""
+    return position < len(lines) and lines[position].lstrip()[:3] in ('"""', "'''")
+
+
+def describe_file(text: str, filepath: Path) -> Optional[str]:
+    """Derive a BRIEF value from a file's own documentation.
+
+    Uses the first line of a Python module docstring, the first heading of a
+    markdown document, or the first descriptive line of a leading ``/**``
+    doc comment. Licence text and tag lines (``@package``) are ignored.
+
+    Returns:
+        The description without a trailing period, or None
+    """
+    candidates: List[str] = []
+    if filepath.suffix == '.py':
+        try:
+            docstring = ast.get_docstring(ast.parse(text))
+        except (SyntaxError, ValueError):
+            docstring = None
+        candidates = (docstring or '').splitlines()
+    elif filepath.suffix == '.md':
+        candidates = [line[2:] for line in text[:HEADER_WINDOW * 4].splitlines() if line.startswith('# ')][:1]
     else:
-        print("✓ All validated files have proper headers")
-        return True
+        match = re.match(r'\s*(?:<\?php\s+)?/\*\*(.*?)\*/', text[:HEADER_WINDOW * 4], re.DOTALL)
+        if match:
+            candidates = [line.strip().lstrip('*').strip() for line in match.group(1).splitlines()]
+
+    for line in candidates:
+        line = line.strip()
+        if not line or line.startswith('@') or 'FILE INFORMATION' in line:
+            continue
+        if any(pattern in line for pattern in REQUIRED_HEADER_PATTERNS):
+            return None
+        return line.rstrip('.')
+    return None
+
+
+def build_fixed_content(
+    text: str,
+    filepath: Path,
+    fields: Dict[str, str],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Compute the fixed content of a file.
+
+    A missing header is inserted in full; in a Python file that already has
+    a module docstring it goes above the docstring as comments, leaving the
+    docstring untouched. When the licence header is present, missing FILE
+    INFORMATION fields are added to the existing block (or a new block is
+    added below the licence text). Missing markdown sections are appended.
+
+    Fields without a value in fields are derived where possible (BRIEF, see
+    describe_file); a file needing a field that has no value is not fixed.
+
+    Returns:
+        Tuple of (new content or None if nothing to fix, error message or None)
+    """
+    style = HEADER_COMMENT_STYLES[HEADER_REQUIRED_EXTENSIONS[filepath.suffix]]
+    newline = '\r\n' if '\r\n' in text[:HEADER_WINDOW] else '\n'
+    lines = text.split(newline)
+    window_lines = text[:HEADER_WINDOW].split(newline)
+    hits = scan_header(text)
+
+    if is_generated_file(text, hits):
+        return None, None
+
+    missing_header = [pattern for pattern in REQUIRED_HEADER_PATTERNS if pattern not in hits]
+    missing_fields = [field for field in FILE_INFO_FIELDS if f"{field}:" not in text[:HEADER_WINDOW]]
+    if 'INGROUP' not in fields:
+        missing_fields = [field for field in missing_fields if field != 'INGROUP']
+    missing_sections = []
+    if filepath.suffix == '.md':
+        missing_sections = [section for section in REQUIRED_MARKDOWN_METADATA if section not in text]
+
+    # Values needed for what is about to be written
+    needed = set()
+    if len(missing_header) == len(REQUIRED_HEADER_PATTERNS):
+        needed.update(FIX_REQUIRED_FIELDS)
+    elif not missing_header:
+        needed.update(field for field in missing_fields if field in FIX_REQUIRED_FIELDS)
+    if missing_sections:
+        needed.add('VERSION')
+    if 'BRIEF' in needed and 'BRIEF' not in fields:
+        brief = describe_file(text, filepath)
+        if brief:
+            fields = dict(fields, BRIEF=brief)
+    unresolved = [field for field in FIX_REQUIRED_FIELDS if field in needed and not fields.get(field)]
+    if unresolved:
+        options = ' '.join(f"--set {field}=..." for field in unresolved)
+        return None, f"No value for {', '.join(unresolved)} (use {options})"
+
+    if len(missing_header) == len(REQUIRED_HEADER_PATTERNS):
+        # No header at all: insert a complete one
+        header = [line.format(year=date.today().year) for line in HEADER_TEMPLATE]
+        header += ['', 'FILE INFORMATION', *file_info_lines(fields, FILE_INFO_FIELDS)]
+        position = header_insert_position(lines, style)
+        existing = lines[position].lstrip() if position < len(lines) else ''
+
+        if style == 'docstring' and starts_docstring(lines, position):
+            # Keep the existing module docstring; the header goes above it
+            lines[position:position] = render_comment(header, 'hash')
+        else:
+            block = render_comment(header, style)
+            if filepath.suffix == '.php' and not (position and lines[position - 1].startswith('<?php')):
+                # Template without an opening PHP tag: keep the comment out of the output
+                block = ['<?php', *block, '?>']
+            spacer = [''] if existing else []
+            lines[position:position] = block + spacer
+    elif missing_header:
+        return None, f"Cannot fix partial licence header (missing: {', '.join(missing_header)})"
+    elif missing_fields:
+        info_index = next(
+            (i for i, line in enumerate(window_lines) if 'FILE INFORMATION' in line), None
+        )
+        if info_index is None:
+            # Add a block below the end of the licence text
+            markers = REQUIRED_HEADER_PATTERNS + ['GNU General Public License for more details', 'along with this program']
+            anchor = max(i for i, line in enumerate(window_lines) if any(marker in line for marker in markers))
+            prefix = line_prefix(window_lines[anchor])
+            block = ['', f"{prefix}FILE INFORMATION", *file_info_lines(fields, missing_fields, prefix)]
+            lines[anchor + 1:anchor + 1] = block
+        else:
+            # Add the missing fields after the existing ones
+            field_pattern = re.compile(r'\s*(?:(?:#|\*|//)\s?)?[A-Z]+:')
+            last = info_index
+            prefix = line_prefix(window_lines[info_index])
+            for index in range(info_index + 1, len(window_lines)):
+                if not field_pattern.match(window_lines[index]):
+                    break
+                if last == info_index:
+                    prefix = line_prefix(window_lines[index])
+                last = index
+            lines[last + 1:last + 1] = file_info_lines(fields, missing_fields, prefix)
+
+    if missing_sections:
+        while lines and lines[-1] == '':
+            lines.pop()
+        for section in missing_sections:
+            lines += ['', section, '']
+            if section == '## Metadata':
+                lines += [
+                    '| Field | Value |',
+                    '|-------|-------|',
+                    f"| Path | {fields['PATH']} |",
+                    f"| Version | {fields['VERSION']} |",
+                ]
+            else:
+                lines += [
+                    '| Date | Version | Author | Notes |',
+                    '|------|---------|--------|-------|',
+                    f"| {date.today().isoformat()} | {fields['VERSION']} | | Header added |",
+                ]
+        lines.append('')
+
+    new_text = newline.join(lines)
+    if new_text == text:
+        return None, None
+    return new_text, None
+
+
+def write_atomic(filepath: Path, text: str) -> None:
+    """Replace a file's content via a temporary file and rename.
+
+    Readers see either the old or the new content, never a partial write.
+    The file mode is preserved.
+    """
+    mode = filepath.stat().st_mode
+    fd, tmp_name = tempfile.mkstemp(dir=str(filepath.parent), prefix=f".{filepath.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.chmod(tmp_name, mode & 0o7777)
+        os.replace(tmp_name, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def fix_file(filepath: Path, repo_path: Path, fields: Dict[str, str], dry_run: bool = False) -> Dict[str, any]:
+    """Write a correct header into a file (process pool worker).
+
+    Build output (see is_build_variant) and minified files are left alone.
+
+    Returns:
+        Dictionary with path, whether it changed, a unified diff (dry run
+        only), why it was skipped and an error message if the file could not
+        be fixed
+    """
+    fix = {'path': str(filepath), 'changed': False, 'diff': '', 'skipped': None, 'error': None}
+
+    if is_build_variant(filepath):
+        fix['skipped'] = 'build output of a source file next to it'
+        return fix
+
+    try:
+        rel_path = filepath.relative_to(repo_path).as_posix()
+    except ValueError:
+        rel_path = filepath.name
+    file_fields = dict(fields, PATH=f"/{rel_path}")
+
+    try:
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        if '.min.' in filepath.name or is_minified(text[:SNIFF_SIZE].encode('utf-8'), DEFAULT_POLICY):
+            fix['skipped'] = 'minified content'
+            return fix
+        new_text, error = build_fixed_content(text, filepath, file_fields)
+        if error:
+            fix['error'] = error
+            return fix
+        if new_text is None:
+            return fix
+
+        fix['changed'] = True
+        if dry_run:
+            fix['diff'] = ''.join(difflib.unified_diff(
+                text.splitlines(keepends=True),
+                new_text.splitlines(keepends=True),
+                fromfile=f"a/{rel_path}",
+                tofile=f"b/{rel_path}",
+            ))
+        else:
+            write_atomic(filepath, new_text)
+    except (OSError, UnicodeDecodeError) as e:
+        fix['error'] = f"Error fixing file: {e}"
+
+    return fix
+
+
+def fix_files(
+    filepaths: List[Path],
+    repo_path: Path,
+    fields: Dict[str, str],
+    jobs: int = 1,
+    dry_run: bool = False,
+) -> Iterator[Dict[str, any]]:
+    """Fix headers of many files, in a process pool when jobs > 1.
+
+    Results are yielded in the order of filepaths.
+    """
+    worker = partial(fix_file, repo_path=repo_path, fields=fields, dry_run=dry_run)
+
+    if jobs > 1 and len(filepaths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, len(filepaths) // (jobs * CHUNKS_PER_JOB))
+            yield from executor.map(worker, filepaths, chunksize=chunksize)
+    else:
+        yield from map(worker, filepaths)
+
+
+class FixCollector(ReportWriter):
+    """Forwards results to another writer and remembers files that need fixing.
+
+    The FILE INFORMATION values of all headers seen are counted, so --fix can
+    fill missing fields with the values the repository already uses.
+    """
+
+    def __init__(self, writer: ReportWriter):
+        super().__init__(writer.stream, writer.repo_path, writer.verbose)
+        self.writer = writer
+        self.paths: List[Path] = []
+        self.values: Dict[str, Counter] = {field: Counter() for field in FILE_INFO_FIELDS}
+
+    def start(self) -> None:
+        self.writer.start()
+
+    def write(self, result: Dict[str, any]) -> None:
+        if result.get('header'):
+            for field, entry in result['header']['fields'].items():
+                if field in self.values and entry['value']:
+                    self.values[field][entry['value']] += 1
+        if is_reportable(result) and not any(
+            issue.startswith('Error reading file') for issue in result['issues']
+        ):
+            self.paths.append(Path(result['path']))
+        self.writer.write(result)
+
+    def finish(self, counters: Dict[str, int]) -> None:
+        self.writer.finish(counters)
+
+
+class IndexCollector(ReportWriter):
+    """Forwards results to another writer and records their headers in a HeaderIndex."""
+
+    def __init__(self, writer: ReportWriter, index: HeaderIndex, complete: bool = False):
+        super().__init__(writer.stream, writer.repo_path, writer.verbose)
+        self.writer = writer
+        self.index = index
+        self.complete = complete
+
+    def start(self) -> None:
+        self.writer.start()
+
+    def write(self, result: Dict[str, any]) -> None:
+        self.index.add(result)
+        self.writer.write(result)
+
+    def finish(self, counters: Dict[str, int]) -> None:
+        self.index.commit(self.complete)
+        self.writer.finish(counters)
+
+
+def changelog_version(repo_path: Path) -> Optional[str]:
+    """Return the newest released version in the repository's CHANGELOG.md."""
+    try:
+        with open(repo_path / 'CHANGELOG.md', 'r', encoding='utf-8', errors='replace') as f:
+            match = CHANGELOG_VERSION.search(f.read(READ_BLOCK_SIZE))
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def default_fix_fields(repo_path: Path, values: Optional[Dict[str, Counter]] = None) -> Dict[str, str]:
+    """Field values used by --fix when not given on the command line.
+
+    REPO comes from the origin remote, VERSION from CHANGELOG.md; otherwise,
+    and for DEFGROUP, the values already used by the repository's headers
+    (see FixCollector) are used: the highest VERSION, the most common of the
+    others. BRIEF is derived per file (see describe_file).
+    """
+    values = values or {}
+    fields = {}
+    try:
+        url = run_git(repo_path, 'remote', 'get-url', 'origin').decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        url = ''
+    if url:
+        if url.startswith('git@') and ':' in url:
+            host, _, path = url[4:].partition(':')
+            url = f"https://{host}/{path}"
+        fields['REPO'] = url[:-4] if url.endswith('.git') else url
+    elif values.get('REPO'):
+        fields['REPO'] = values['REPO'].most_common(1)[0][0]
+
+    versions = [value for value in values.get('VERSION', ()) if VERSION_VALUE.fullmatch(value)]
+    version = changelog_version(repo_path)
+    if version is None and versions:
+        version = max(versions, key=lambda value: tuple(int(part) for part in value.split('.')))
+    if version is not None:
+        fields['VERSION'] = version
+
+    if values.get('DEFGROUP'):
+        fields['DEFGROUP'] = values['DEFGROUP'].most_common(1)[0][0]
+    return fields
 
 
 def main():
@@ -307,20 +1851,196 @@ def main():
         action='store_true',
         help='Exit with error code if invalid headers found'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes (default: 1, 0 = one per CPU core)'
+    )
+    parser.add_argument(
+        '--no-gitignore',
+        action='store_true',
+        help='Also validate files ignored by .gitignore'
+    )
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument(
+        '--since',
+        metavar='REF',
+        help='Only validate files changed since the merge base of REF and HEAD'
+    )
+    scope.add_argument(
+        '--staged',
+        action='store_true',
+        help='Only validate staged files, reading their content from the git index'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not use the result cache (default location: {DEFAULT_CACHE_PATH})'
+    )
+    for classification in ('binary', 'oversized', 'minified'):
+        parser.add_argument(
+            f'--{classification}-policy',
+            choices=POLICY_ACTIONS,
+            default=getattr(DEFAULT_POLICY, classification),
+            help=f'How to handle {classification} files (default: {getattr(DEFAULT_POLICY, classification)})'
+        )
+    parser.add_argument(
+        '--max-size',
+        type=int,
+        default=MAX_FILE_SIZE,
+        help=f'Size in bytes above which a file is oversized (default: {MAX_FILE_SIZE})'
+    )
+    parser.add_argument(
+        '--fix',
+        action='store_true',
+        help='Write missing headers and FILE INFORMATION fields into invalid files'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --fix, print a unified diff to stderr instead of writing files'
+    )
+    parser.add_argument(
+        '--set',
+        metavar='FIELD=VALUE',
+        action='append',
+        default=[],
+        help=f"FILE INFORMATION value used by --fix (fields: {', '.join(FILE_INFO_FIELDS)}; PATH is "
+             "automatic, others default to the values the repository already uses)"
+    )
+    parser.add_argument(
+        '--header-index',
+        type=Path,
+        metavar='DB',
+        help='Record parsed FILE INFORMATION blocks in this SQLite index (see HeaderIndex)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=sorted(REPORT_WRITERS),
+        default='text',
+        help='Report format (default: text)'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        help='Write the report to this file instead of stdout'
+    )
 
     args = parser.parse_args()
 
+    if args.fix and args.staged:
+        parser.error('--fix cannot be combined with --staged')
+    fields_given = {}
+    for assignment in args.set:
+        field, sep, value = assignment.partition('=')
+        if not sep or field.upper() not in FILE_INFO_FIELDS:
+            parser.error(f"invalid --set value: {assignment}")
+        fields_given[field.upper()] = value
+
     repo_path = Path(args.path).resolve()
 
     if not repo_path.exists():
         print(f"Error: Path does not exist: {repo_path}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Validating files in: {repo_path}")
-    print()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    policy = ClassificationPolicy(
+        binary=args.binary_policy,
+        oversized=args.oversized_policy,
+        minified=args.minified_policy,
+        max_size=args.max_size,
+    )
+
+    if args.format == 'text' and args.output is None:
+        print(f"Validating files in: {repo_path}")
+        print()
+
+    try:
+        stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    except OSError as e:
+        print(f"Error: cannot write report: {e}", file=sys.stderr)
+        sys.exit(1)
+    writer = REPORT_WRITERS[args.format](stream, repo_path, args.verbose)
+    index = None
+    if args.header_index:
+        try:
+            index = HeaderIndex(args.header_index, repo_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error: cannot open header index: {e}", file=sys.stderr)
+            sys.exit(1)
+        complete = not (args.since or args.staged)
+        writer = IndexCollector(writer, index, complete)
+    if args.fix:
+        writer = FixCollector(writer)
 
-    results = validate_repository(repo_path)
-    success = print_report(results, args.verbose)
+    try:
+        if args.staged:
+            try:
+                counters = validate_staged(repo_path, writer, policy)
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"Error: could not read git index: {git_error(e)}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            files = None
+            if args.since:
+                try:
+                    files = changed_files_since(repo_path, args.since)
+                except (OSError, subprocess.CalledProcessError) as e:
+                    print(f"Error: could not list changes since {args.since}: {git_error(e)}", file=sys.stderr)
+                    sys.exit(1)
+
+            cache = None
+            if not args.no_cache:
+                try:
+                    cache = HeaderCache(policy=policy)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Warning: result cache disabled: {e}", file=sys.stderr)
+
+            try:
+                counters = validate_repository(
+                    repo_path, jobs=jobs, cache=cache, files=files,
+                    use_gitignore=not args.no_gitignore, writer=writer, policy=policy
+                )
+            finally:
+                if cache is not None:
+                    cache.close()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        if index is not None:
+            index.close()
+
+    success = counters['invalid'] == 0
+
+    if args.fix and writer.paths:
+        fields = dict(default_fix_fields(repo_path, writer.values), **fields_given)
+        changed = failed = skipped = still_invalid = 0
+        for fix in fix_files(writer.paths, repo_path, fields, jobs, args.dry_run):
+            if fix['error']:
+                failed += 1
+                print(f"✗ {fix['path']}: {fix['error']}", file=sys.stderr)
+            elif fix['skipped']:
+                skipped += 1
+                print(f"- {fix['path']}: not fixed, {fix['skipped']}", file=sys.stderr)
+            elif fix['changed']:
+                changed += 1
+                if args.dry_run:
+                    sys.stderr.write(fix['diff'])
+                else:
+                    # Check the rewritten file before counting it as fixed
+                    result = validate_file(Path(fix['path']), policy=policy)
+                    if is_reportable(result):
+                        still_invalid += 1
+                        print(f"✗ {fix['path']}: still invalid: {'; '.join(result['issues'])}", file=sys.stderr)
+        action = 'Would fix' if args.dry_run else 'Fixed'
+        print(
+            f"{action} {changed - still_invalid} file(s); {failed} could not be fixed, "
+            f"{skipped} skipped, {still_invalid} still invalid",
+            file=sys.stderr
+        )
+        if not args.dry_run:
+            success = changed - still_invalid == counters['invalid']
 
     if args.fail_on_invalid and not success:
         sys.exit(1)
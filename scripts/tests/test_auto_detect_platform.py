@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+
+This file is part of a Moko Consulting project.
+
+SPDX-License-Identifier: GPL-3.0-or-later
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+FILE INFORMATION
+DEFGROUP: MokoStandards.Scripts
+INGROUP: MokoStandards.Tests
+REPO: https://github.com/mokoconsulting-tech/MokoStandards
+PATH: /scripts/tests/test_auto_detect_platform.py
+VERSION: 05.00.00
+BRIEF: Tests for auto_detect_platform.py
+"""
+
+import subprocess
+import zipfile
+
+from auto_detect_platform import PlatformDetector, PlatformType, open_index
+
+
+def make_joomla_tree(root):
+    for name in ('site', 'admin', 'administrator'):
+        (root / name).mkdir(parents=True)
+        (root / name / 'index.html').write_text('')
+    css_dir = root / 'media' / 'vendor' / 'x'
+    css_dir.mkdir(parents=True)
+    (css_dir / 'a.css').write_text('body {}\n')
+
+
+def detect(repo_path, ref=None):
+    index = open_index(repo_path, ref)
+    try:
+        return PlatformDetector(repo_path, index=index).detect()
+    finally:
+        if index is not None:
+            index.close()
+
+
+def test_media_css_only_under_vendor_counts(tmp_path):
+    make_joomla_tree(tmp_path)
+    result = detect(tmp_path)
+    assert result.platform_type == PlatformType.JOOMLA
+    assert result.confidence == 50
+    assert 'Joomla media directory with assets' in result.indicators
+
+
+def test_media_css_only_under_vendor_counts_in_zip_packages(tmp_path):
+    tree = tmp_path / 'tree'
+    make_joomla_tree(tree)
+    package = tmp_path / 'package.zip'
+    with zipfile.ZipFile(package, 'w') as archive:
+        for path in sorted(tree.rglob('*')):
+            if path.is_file():
+                archive.write(path, path.relative_to(tree).as_posix())
+    result = detect(package)
+    assert (result.platform_type, result.confidence) == (PlatformType.JOOMLA, 50)
+
+
+def test_media_css_only_under_vendor_counts_in_git_objects(tmp_path):
+    make_joomla_tree(tmp_path)
+    git = ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com']
+    subprocess.run(['git', 'init', '-q'], cwd=tmp_path, check=True)
+    subprocess.run(['git', 'add', '.'], cwd=tmp_path, check=True)
+    subprocess.run([*git, 'commit', '-q', '-m', 'tree'], cwd=tmp_path, check=True)
+    result = detect(tmp_path, 'HEAD')
+    assert (result.platform_type, result.confidence) == (PlatformType.JOOMLA, 50)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+
+This file is part of a Moko Consulting project.
+
+SPDX-License-Identifier: GPL-3.0-or-later
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+FILE INFORMATION
+DEFGROUP: MokoStandards.Scripts
+INGROUP: MokoStandards.Tests
+REPO: https://github.com/mokoconsulting-tech/MokoStandards
+PATH: /scripts/tests/test_validate_codeql_config.py
+VERSION: 05.00.00
+BRIEF: Tests for validate_codeql_config.py
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import validate_codeql_config
+from repo_walker import FileEntry
+from validate_codeql_config import WorkflowCache, classify_source_file
+
+
+def test_workflow_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(validate_codeql_config, 'WORKFLOW_CACHE_MAX_ENTRIES', 2)
+    cache = WorkflowCache(tmp_path / 'workflows.json')
+    cache.set('hot', {'languages': {}, 'configs': []})
+    cache.set('cold', {'languages': {}, 'configs': []})
+    assert cache.get('hot') is not None
+    cache.set('new', {'languages': {}, 'configs': []})
+    cache.save()
+
+    saved = json.loads((tmp_path / 'workflows.json').read_text())
+    assert list(saved['entries']) == ['hot', 'new']
+    assert [path.name for path in tmp_path.iterdir()] == ['workflows.json']
+
+
+def test_workflow_cache_counts_from_threads(tmp_path):
+    cache = WorkflowCache(tmp_path / 'workflows.json')
+    cache.set('known', {'languages': {}, 'configs': []})
+    digests = ['known', 'unknown'] * 500
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cache.get, digests))
+    assert (cache.hits, cache.misses) == (500, 500)
+
+
+def classify(path):
+    return classify_source_file(FileEntry.from_path(path, path.parent), {})
+
+
+def test_es5_variant_with_source_is_generated(tmp_path):
+    (tmp_path / 'menu-metismenu.js').write_text('export const menu = 1;\n')
+    variant = tmp_path / 'menu-metismenu-es5.js'
+    variant.write_text('var menu = 1;\n')
+    assert classify(variant) == ('generated', 'build output of menu-metismenu.js')
+    assert classify(tmp_path / 'menu-metismenu.js') is None
+
+
+def test_lone_es5_file_is_source(tmp_path):
+    lone = tmp_path / 'foo-es5.js'
+    lone.write_text('var foo = 1;\n')
+    assert classify(lone) is None
+
+
+def test_detection_and_measurement_agree_on_ignored_files(tmp_path):
+    (tmp_path / '.gitignore').write_text('build/\n')
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'build' / 'generated.go').write_text('package main\n')
+    (tmp_path / 'main.py').write_text('print(1)\n')
+
+    detected = validate_codeql_config.detect_languages_in_repo(tmp_path)
+    stats = validate_codeql_config.measure_languages(tmp_path)
+    assert detected == {'python': 1}
+    assert list(stats) == list(detected)
+
+    files = validate_codeql_config.checkout_files(tmp_path)
+    assert validate_codeql_config.detect_languages_in_repo(tmp_path, files=files) == detected
+    assert list(validate_codeql_config.measure_languages(tmp_path, files=files)) == list(detected)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+
+This file is part of a Moko Consulting project.
+
+SPDX-License-Identifier: GPL-3.0-or-later
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+FILE INFORMATION
+DEFGROUP: MokoStandards.Scripts
+INGROUP: MokoStandards.Tests
+REPO: https://github.com/mokoconsulting-tech/MokoStandards
+PATH: /scripts/tests/test_validate_file_headers.py
+VERSION: 05.00.00
+BRIEF: Tests for validate_file_headers.py
+"""
+
+import os
+
+from repo_walker import FileEntry
+from validate_file_headers import HeaderCache, validate_batch
+
+HEADER = '''# Copyright (C) 2026 Moko Consulting <hello@mokoconsulting.tech>
+# SPDX-License-Identifier: GPL-3.0-or-later
+# FILE INFORMATION
+# DEFGROUP: Tests
+# PATH: /example.py
+# VERSION: 01.00.00
+# BRIEF: Example
+'''
+
+
+def run_cached(path, cache):
+    return validate_batch([FileEntry.from_path(path, path.parent)], None, 1, cache)
+
+
+def test_touched_file_is_a_cache_hit(tmp_path):
+    path = tmp_path / 'example.py'
+    path.write_text(HEADER)
+    cache = HeaderCache(tmp_path / 'cache.sqlite3')
+    first = run_cached(path, cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Same content, new mtime, as after a fresh checkout
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = run_cached(path, cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second[0]['valid'] == first[0]['valid']
+    assert second[0]['issues'] == first[0]['issues']
+
+    # The refreshed mtime makes the next run a hit without reading the file
+    third = run_cached(path, cache)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert third[0]['bytes_read'] == 0
+    cache.close()
+
+
+def test_changed_content_is_a_cache_miss(tmp_path):
+    path = tmp_path / 'example.py'
+    path.write_text(HEADER)
+    cache = HeaderCache(tmp_path / 'cache.sqlite3')
+    run_cached(path, cache)
+
+    stat = path.stat()
+    path.write_text(HEADER.replace('Tests', 'Other'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    run_cached(path, cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    cache.close()
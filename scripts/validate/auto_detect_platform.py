@@ -10,7 +10,11 @@ Platform detection capabilities:
     - Generic repositories (fallback with confidence scoring)
 
 Usage:
-    python3 auto_detect_platform.py [--repo-path PATH] [--json] [--verbose] [--cache]
+    python3 auto_detect_platform.py [--repo-path PATH ...] [--json] [--verbose] [--explain] [--cache]
+    python3 auto_detect_platform.py [--manifest FILE] [--parent DIR] [--workers N] [--timeout SECONDS]
+    python3 auto_detect_platform.py --serve [--socket PATH]
+    python3 auto_detect_platform.py --repo-path PATH --ref REF
+    python3 auto_detect_platform.py --repo-path PATH --packages
 
 Examples:
     # Auto-detect current repository with JSON output
@@ -19,31 +23,143 @@ Examples:
     # Detect specific repository with caching
     python3 auto_detect_platform.py --repo-path /path/to/repo --cache --verbose
 
+    # Show which indicators were evaluated and which were skipped
+    python3 auto_detect_platform.py --repo-path /path/to/repo --explain
+
     # JSON output for CI/CD automation
     python3 auto_detect_platform.py --json | jq '.platform_type'
 
+    # Fleet mode: every repository below a directory, as JSON Lines
+    python3 auto_detect_platform.py --parent /srv/clients --workers 8 --timeout 60
+
+    # Detect an extension package without extracting it
+    python3 auto_detect_platform.py --repo-path com_example.zip
+
+    # Detect a branch of a bare mirror without checking it out
+    python3 auto_detect_platform.py --repo-path /srv/mirrors/client.git --ref main
+
+    # One result per extension or module in a monorepo
+    python3 auto_detect_platform.py --repo-path /path/to/monorepo --packages --json
+
+    # Resident daemon for CI agents, then thin clients against it
+    python3 auto_detect_platform.py --serve &
+    python3 auto_detect_platform.py --socket --json
+
+    # Same, without importing the detector (see detect_platform_client.py)
+    python3 detect_platform_client.py --json
+
 Exit codes:
     0: Success (platform detected successfully)
-    1: Detection failed (no platform could be determined)
+    1: Detection failed (no platform could be determined; in fleet mode,
+       any repository failed or timed out)
     2: Configuration error (invalid arguments or paths)
 """
 
 import argparse
+import bisect
+import codecs
+import ctypes
+import ctypes.util
+import errno
 import hashlib
+import io
 import json
 import os
-import pickle
+import re
+import signal
+import socket
+import socketserver
+import sqlite3
+import struct
+import subprocess
 import sys
+import threading
+import time
 import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
 from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+from detect_platform_client import DEFAULT_SOCKET_PATH as CLIENT_SOCKET_PATH, query_daemon
 
 
 # Version
 __version__ = "03.00.00"
 
+# Detection cache settings; the schema version is combined with __version__
+CACHE_SCHEMA_VERSION = 1
+CACHE_DB_NAME = "cache.sqlite3"
+CACHE_TTL = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 1000
+CACHE_LOCK_TIMEOUT = 30.0
+
+# Joomla extension types recognised in manifest type attributes
+JOOMLA_EXTENSION_TYPES = ["component", "module", "plugin", "library", "template", "file"]
+
+# Number of bytes checked before an XML file is parsed
+XML_SNIFF_SIZE = 64
+
+# Strings whose presence marks a Dolibarr module descriptor
+DOLIBARR_DESCRIPTOR_MARKERS = [
+    "extends DolibarrModules",
+    "class mod",
+    "$this->numero",
+    "$this->rights_class",
+    "DolibarrModules",
+    "dol_include_once"
+]
+DOLIBARR_DESCRIPTOR_THRESHOLD = 3
+
+# All descriptor markers in one pass; the lookahead also reports markers
+# that overlap ("DolibarrModules" inside "extends DolibarrModules")
+DOLIBARR_MARKER_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(marker) for marker in DOLIBARR_DESCRIPTOR_MARKERS) + "))"
+)
+DOLIBARR_CLASS_PATTERN = re.compile(r"class\s+(mod\w+)")
+
+# Characters kept from one chunk to the next so that a marker or class
+# declaration split across chunks is still matched
+DOLIBARR_SCAN_OVERLAP = 256
+
+# Chunk size used when scanning descriptor candidates
+DESCRIPTOR_READ_SIZE = 8192
+
+# Confidence a platform detector must reach to be selected
+DETECTION_THRESHOLD = 50
+
+# Daemon mode: socket location (shared with the thin client), the number of
+# repositories and inotify watches held before the least recently used
+# repository is dropped, and the inotify(7) events that invalidate a tree
+DEFAULT_SOCKET_PATH = Path(CLIENT_SOCKET_PATH)
+DAEMON_MAX_REPOSITORIES = 64
+DAEMON_MAX_WATCHES = 65536
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# Relative indicator costs: index lookups versus file content reads
+COST_LOOKUP = 1
+COST_CONTENT = 10
+
 
 class PlatformType(Enum):
     """Repository platform types enumeration."""
@@ -82,25 +198,770 @@ class DetectionResult:
             "metadata": self.metadata
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]) -> "DetectionResult":
+        """Create detection result from its dictionary representation.
 
-class DetectionCache:
-    """Simple file-based cache for platform detection results.
+        Args:
+            data: Dictionary produced by to_dict().
+
+        Returns:
+            DetectionResult instance.
+        """
+        return cls(
+            platform_type=PlatformType(data["platform_type"]),
+            confidence=int(data["confidence"]),
+            indicators=list(data["indicators"]),
+            metadata=dict(data["metadata"])
+        )
 
-    Caches detection results based on repository path hash to avoid
-    re-scanning the same repository repeatedly.
+
+# Directories whose content is never indexed
+INDEX_SKIP_DIRS = {".git", "vendor", "node_modules"}
+
+
+class RepositoryIndex:
+    """In-memory index of a repository tree, built in a single walk.
+
+    Holds every file path (relative, '/' separated), the files per suffix and
+    the set of directories with their mtimes. Skipped directories are
+    recorded but not descended into. Directory symlinks are recorded as
+    directories and not followed. All detectors query the index instead of
+    globbing, and callers that also validate structure can reuse it; the
+    few checks that must see inside skipped directories use has_file_below.
     """
 
-    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        repo_path: Path,
+        files: List[str],
+        dirs: Dict[str, int],
+        skipped_dirs: Optional[List[str]] = None,
+        skipped_files: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize index.
+
+        Args:
+            repo_path: Path to repository root.
+            files: Relative paths of all indexed files, sorted.
+            dirs: Relative paths of all directories mapped to their mtime in
+                nanoseconds ("" is the root).
+            skipped_dirs: Relative paths of the skipped directories.
+            skipped_files: Relative paths of the files below skipped
+                directories, when the backend lists them anyway; None to
+                look for them on the filesystem.
+        """
+        self.repo_path = repo_path
+        self.files = files
+        self.dirs = dirs
+        self.skipped_dirs = skipped_dirs or []
+        self.skipped_files = skipped_files
+        self.file_set = set(files)
+        self.by_suffix: Dict[str, List[str]] = {}
+        for rel_path in files:
+            name = rel_path.rpartition("/")[2]
+            dot = name.rfind(".")
+            if dot > 0:
+                self.by_suffix.setdefault(name[dot:], []).append(rel_path)
+
+    @classmethod
+    def build(
+        cls,
+        repo_path: Path,
+        skip_dirs: Optional[set] = None,
+        on_directory: Optional[Callable[[Path], None]] = None,
+    ) -> "RepositoryIndex":
+        """Walk the repository once and index it.
+
+        Args:
+            repo_path: Path to repository root.
+            skip_dirs: Directory names not descended into. Defaults to INDEX_SKIP_DIRS.
+            on_directory: Called with each directory before it is listed
+                (used by the daemon to watch the tree).
+
+        Returns:
+            RepositoryIndex for the tree.
+        """
+        if skip_dirs is None:
+            skip_dirs = INDEX_SKIP_DIRS
+
+        files: List[str] = []
+        dirs: Dict[str, int] = {}
+        skipped_dirs: List[str] = []
+        stack = [("", repo_path)]
+        while stack:
+            rel_dir, dir_path = stack.pop()
+            if on_directory is not None:
+                on_directory(dir_path)
+            try:
+                dirs[rel_dir] = dir_path.stat().st_mtime_ns
+                with os.scandir(dir_path) as scanner:
+                    entries = sorted(scanner, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in skip_dirs:
+                            dirs[rel_path] = entry.stat(follow_symlinks=False).st_mtime_ns
+                            skipped_dirs.append(rel_path)
+                        else:
+                            subdirs.append((rel_path, Path(entry.path)))
+                    elif entry.is_file():
+                        files.append(rel_path)
+                    elif entry.is_dir():
+                        dirs[rel_path] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirs))
+
+        files.sort()
+        return cls(repo_path, files, dirs, skipped_dirs)
+
+    def exists(self, rel_path: str) -> bool:
+        """Check whether a file or directory exists.
+
+        Args:
+            rel_path: Path relative to the repository root.
+
+        Returns:
+            True if the path was indexed as a file or directory.
+        """
+        return rel_path in self.file_set or rel_path in self.dirs
+
+    def is_dir(self, rel_path: str) -> bool:
+        """Check whether a directory exists.
+
+        Args:
+            rel_path: Path relative to the repository root.
+
+        Returns:
+            True if the path was indexed as a directory.
+        """
+        return rel_path in self.dirs
+
+    def has_file_below(self, rel_dir: str, suffix: str) -> bool:
+        """Check whether a directory holds a file with an extension at any depth.
+
+        Unlike files_with_suffix, this also looks inside skipped directories
+        (media/vendor/ holds assets like any other media directory). Those
+        are searched on the filesystem, stopping at the first match.
+
+        Args:
+            rel_dir: Directory relative to the repository root.
+            suffix: File extension including the dot.
+
+        Returns:
+            True if such a file exists below rel_dir.
+        """
+        prefix = f"{rel_dir}/"
+        if any(rel_path.startswith(prefix) for rel_path in self.files_with_suffix(suffix)):
+            return True
+        if self.skipped_files is not None:
+            return any(
+                rel_path.startswith(prefix) and rel_path.endswith(suffix)
+                for rel_path in self.skipped_files
+            )
+        return any(
+            any(self.path(skipped).rglob(f"*{suffix}"))
+            for skipped in self.skipped_dirs if skipped.startswith(prefix)
+        )
+
+    def files_with_suffix(self, suffix: str) -> List[str]:
+        """List files by extension.
+
+        Args:
+            suffix: File extension including the dot.
+
+        Returns:
+            Sorted relative paths of the files with that extension.
+        """
+        return self.by_suffix.get(suffix, [])
+
+    def path(self, rel_path: str) -> Path:
+        """Return the full path of an indexed file.
+
+        Args:
+            rel_path: Path relative to the repository root.
+
+        Returns:
+            Absolute path.
+        """
+        return self.repo_path / rel_path
+
+    def source(self, rel_path: str) -> Union[Path, BinaryIO]:
+        """Return what the content scanners read an indexed file from.
+
+        Args:
+            rel_path: Path relative to the repository root.
+
+        Returns:
+            Full path of the file (GitObjectIndex returns the blob instead).
+        """
+        return self.path(rel_path)
+
+    def subtree(self, rel_dir: str, exclude: Iterable[str] = ()) -> "RepositoryIndex":
+        """Return a view of the index rooted at a subdirectory, without walking again.
+
+        Args:
+            rel_dir: Directory relative to the repository root ("" for the root).
+            exclude: Directories below rel_dir, relative to the repository
+                root, left out of the view.
+
+        Returns:
+            SubtreeIndex whose paths are relative to rel_dir.
+        """
+        return SubtreeIndex(self, rel_dir, exclude)
+
+    def close(self) -> None:
+        """Release resources held by the index (none for work trees)."""
+
+    def fingerprint(self) -> str:
+        """Fingerprint the tree from directory and marker file mtimes.
+
+        Directory mtimes capture files and directories being added, removed
+        or renamed, which covers the existence checks of the detectors. The
+        files whose content the detectors read (XML manifests and Dolibarr
+        PHP descriptors) add their size and mtime.
+
+        Returns:
+            Fingerprint string.
+        """
+        digest = hashlib.sha256()
+        for rel_dir in sorted(self.dirs):
+            digest.update(f"{rel_dir}:{self.dirs[rel_dir]}\n".encode())
+
+        markers = self.files_with_suffix(".xml") + [
+            rel_path for rel_path in self.files_with_suffix(".php")
+            if "/core/modules/" in f"/{rel_path}" or rel_path.rpartition("/")[2].startswith("mod")
+        ]
+        for rel_path in markers:
+            try:
+                stat = self.path(rel_path).stat()
+            except OSError:
+                continue
+            digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+        return f"stat:{digest.hexdigest()}"
+
+
+class GitObjectIndex(RepositoryIndex):
+    """Repository index read from git objects instead of a work tree.
+
+    The tree of a ref is listed with ``git ls-tree``, and blobs are read on
+    demand through one long-lived ``git cat-file --batch`` process, so bare
+    repositories and any commit can be detected without a checkout. Paths
+    below INDEX_SKIP_DIRS are dropped as the filesystem walk would; symlinks
+    count as files and submodules as directories.
+    """
+
+    def __init__(self, repo_path: Path, files: List[str], dirs: Dict[str, int], tree: str, blobs: Dict[str, str],
+                 skipped_files: Optional[List[str]] = None) -> None:
+        """Initialize index.
+
+        Args:
+            repo_path: Path to the repository (bare or not).
+            files: Relative paths of all indexed files, sorted.
+            dirs: Relative paths of all directories ("" is the root); values
+                are unused and 0.
+            tree: Id of the tree the index was built from.
+            blobs: Blob id of each file.
+            skipped_files: Relative paths of the blobs below skipped directories.
+        """
+        super().__init__(repo_path, files, dirs, skipped_files=skipped_files or [])
+        self.tree = tree
+        self.blobs = blobs
+        self._batch: Optional[subprocess.Popen] = None
+        self._batch_lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls,
+        repo_path: Path,
+        ref: str = "HEAD",
+        skip_dirs: Optional[set] = None,
+    ) -> "GitObjectIndex":
+        """List the tree of a ref.
+
+        Args:
+            repo_path: Path to the repository (bare or not).
+            ref: Commit, branch, tag or tree to detect.
+            skip_dirs: Directory names not descended into. Defaults to INDEX_SKIP_DIRS.
+
+        Returns:
+            GitObjectIndex for the tree.
+
+        Raises:
+            ValueError: If repo_path is not a git repository or ref does not
+                name a tree.
+        """
+        if skip_dirs is None:
+            skip_dirs = INDEX_SKIP_DIRS
+
+        try:
+            tree = subprocess.run(
+                ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{tree}}"],
+                cwd=repo_path, capture_output=True, check=True
+            ).stdout.decode().strip()
+            listing = subprocess.run(
+                ["git", "ls-tree", "-r", "-t", "-z", "--full-tree", tree],
+                cwd=repo_path, capture_output=True, check=True
+            ).stdout
+        except OSError as e:
+            raise ValueError(f"Cannot run git: {e}")
+        except subprocess.CalledProcessError:
+            raise ValueError(f"Not a git repository or unknown ref '{ref}': {repo_path}")
+
+        files: List[str] = []
+        dirs: Dict[str, int] = {"": 0}
+        blobs: Dict[str, str] = {}
+        skipped_files: List[str] = []
+        for record in listing.split(b"\0"):
+            if not record:
+                continue
+            info, _, raw_path = record.partition(b"\t")
+            _mode, object_type, object_id = info.decode().split(" ")
+            rel_path = os.fsdecode(raw_path)
+
+            parent, _, name = rel_path.rpartition("/")
+            if any(part in skip_dirs for part in parent.split("/")):
+                if object_type == "blob":
+                    skipped_files.append(rel_path)
+                continue
+
+            if object_type == "blob":
+                files.append(rel_path)
+                blobs[rel_path] = object_id
+            else:
+                # Trees, and submodules (commits), are directories
+                dirs[rel_path] = 0
+
+        files.sort()
+        return cls(repo_path, files, dirs, tree, blobs, skipped_files)
+
+    def source(self, rel_path: str) -> Union[Path, BinaryIO]:
+        """Return the content of an indexed file.
+
+        Args:
+            rel_path: Path relative to the repository root.
+
+        Returns:
+            In-memory stream with the blob (empty if it cannot be read).
+        """
+        return io.BytesIO(self.read_blob(self.blobs.get(rel_path, "")))
+
+    def read_blob(self, object_id: str) -> bytes:
+        """Read a blob through the shared cat-file process.
+
+        Args:
+            object_id: Blob id.
+
+        Returns:
+            Blob content, or b"" if the object is missing or git failed.
+        """
+        if not object_id:
+            return b""
+
+        with self._batch_lock:
+            try:
+                if self._batch is None:
+                    self._batch = subprocess.Popen(
+                        ["git", "cat-file", "--batch"],
+                        cwd=self.repo_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+                    )
+                self._batch.stdin.write(f"{object_id}\n".encode())
+                self._batch.stdin.flush()
+
+                header = self._batch.stdout.readline().split()
+                if len(header) != 3:
+                    # "<id> missing"
+                    return b""
+                content = self._batch.stdout.read(int(header[2]))
+                self._batch.stdout.read(1)
+                return content
+            except (OSError, ValueError):
+                self.close()
+                return b""
+
+    def fingerprint(self) -> str:
+        """Fingerprint the tree; its id covers all content.
+
+        Returns:
+            Fingerprint string.
+        """
+        return f"git-tree:{self.tree}"
+
+    def close(self) -> None:
+        """Stop the cat-file process, if running."""
+        if self._batch is not None:
+            try:
+                self._batch.stdin.close()
+                self._batch.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._batch.kill()
+            self._batch = None
+
+
+class ZipArchiveIndex(RepositoryIndex):
+    """Repository index read from a zip package without extracting it.
+
+    Only the central directory is read to list the entries. File content
+    is stream-decompressed on demand, and the scanners stop reading once
+    they have what they need, so a large package costs kilobytes of I/O.
+    Paths are indexed as they would be after extracting the package into
+    a directory; directories missing from the listing are implied by the
+    files in them.
+    """
+
+    def __init__(self, repo_path: Path, files: List[str], dirs: Dict[str, int], archive: zipfile.ZipFile,
+                 entries: Dict[str, zipfile.ZipInfo], skipped_files: Optional[List[str]] = None) -> None:
+        """Initialize index.
+
+        Args:
+            repo_path: Path to the zip file.
+            files: Relative paths of all indexed files, sorted.
+            dirs: Relative paths of all directories ("" is the root); values
+                are unused and 0.
+            archive: Open archive.
+            entries: Archive entry of each file.
+            skipped_files: Relative paths of the files below skipped directories.
+        """
+        super().__init__(repo_path, files, dirs, skipped_files=skipped_files or [])
+        self.archive = archive
+        self.entries = entries
+
+    @classmethod
+    def build(cls, repo_path: Path, skip_dirs: Optional[set] = None) -> "ZipArchiveIndex":
+        """List the entries of a zip package.
+
+        Args:
+            repo_path: Path to the zip file.
+            skip_dirs: Directory names not descended into. Defaults to INDEX_SKIP_DIRS.
+
+        Returns:
+            ZipArchiveIndex for the package.
+
+        Raises:
+            ValueError: If the file is not a readable zip archive.
+        """
+        if skip_dirs is None:
+            skip_dirs = INDEX_SKIP_DIRS
+
+        try:
+            archive = zipfile.ZipFile(repo_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Cannot read zip package {repo_path}: {e}")
+
+        files: List[str] = []
+        dirs: Dict[str, int] = {"": 0}
+        entries: Dict[str, zipfile.ZipInfo] = {}
+        skipped_files: List[str] = []
+        for info in archive.infolist():
+            rel_path = info.filename.replace("\\", "/")
+            while rel_path.startswith(("/", "./")):
+                rel_path = rel_path[2:] if rel_path.startswith("./") else rel_path[1:]
+            is_dir = rel_path.endswith("/")
+            rel_path = rel_path.rstrip("/")
+            parts = rel_path.split("/")
+            if not rel_path or ".." in parts:
+                continue
+
+            # Stop at the first skipped directory, which is recorded itself
+            for depth, part in enumerate(parts[:-1]):
+                dirs.setdefault("/".join(parts[:depth + 1]), 0)
+                if part in skip_dirs:
+                    if not is_dir:
+                        skipped_files.append(rel_path)
+                    break
+            else:
+                if is_dir:
+                    dirs.setdefault(rel_path, 0)
+                elif rel_path not in entries:
+                    files.append(rel_path)
+                    entries[rel_path] = info
+
+        files.sort()
+        return cls(repo_path, files, dirs, archive, entries, skipped_files)
+
+    def source(self, rel_path: str) -> Union[Path, BinaryIO]:
+        """Return a decompressing stream over an archive entry.
+
+        Args:
+            rel_path: Path relative to the package root.
+
+        Returns:
+            Seekable stream with the entry content (empty if it cannot be
+            opened, e.g. when encrypted or using an unsupported compression).
+        """
+        try:
+            return self.archive.open(self.entries[rel_path])
+        except (KeyError, RuntimeError, NotImplementedError, OSError, zipfile.BadZipFile):
+            return io.BytesIO(b"")
+
+    def fingerprint(self) -> str:
+        """Fingerprint the package from its size, mtime and entry checksums.
+
+        Returns:
+            Fingerprint string.
+        """
+        digest = hashlib.sha256()
+        stat = self.repo_path.stat()
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        for rel_path in self.files:
+            digest.update(f"{rel_path}:{self.entries[rel_path].CRC}\n".encode())
+        return f"zip:{digest.hexdigest()}"
+
+    def close(self) -> None:
+        """Close the archive."""
+        self.archive.close()
+
+
+class SubtreeIndex(RepositoryIndex):
+    """View of another index rooted at one of its directories.
+
+    Built from the parent's sorted file list, so any backend (work tree,
+    git objects, zip package) can be split into package roots after a
+    single traversal. Content is read through the parent. Excluded
+    directories (nested package roots) are left out of the view entirely.
+    """
+
+    def __init__(self, parent: RepositoryIndex, rel_dir: str, exclude: Iterable[str] = ()) -> None:
+        """Initialize view.
+
+        Args:
+            parent: Index of the whole repository.
+            rel_dir: Directory of the view relative to the parent's root
+                ("" for the root).
+            exclude: Directories below rel_dir, relative to the parent's
+                root, left out of the view.
+        """
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        # Paths under a directory are contiguous in the sorted file list
+        start = bisect.bisect_left(parent.files, prefix)
+        end = bisect.bisect_left(parent.files, prefix + "\U0010ffff", start)
+        files = parent.files[start:end]
+        excluded = [f"{directory}/" for directory in exclude]
+        for excluded_prefix in excluded:
+            low = bisect.bisect_left(files, excluded_prefix)
+            high = bisect.bisect_left(files, excluded_prefix + "\U0010ffff", low)
+            del files[low:high]
+        files = [rel_path[len(prefix):] for rel_path in files]
+        dirs = {"": parent.dirs.get(rel_dir, 0)}
+        dirs.update(
+            (rel_path[len(prefix):], mtime) for rel_path, mtime in parent.dirs.items()
+            if rel_path.startswith(prefix) and rel_path != rel_dir
+            and not any(f"{rel_path}/".startswith(excluded_prefix) for excluded_prefix in excluded)
+        )
+
+        skipped_dirs = [
+            rel_path[len(prefix):] for rel_path in parent.skipped_dirs
+            if rel_path.startswith(prefix)
+            and not any(f"{rel_path}/".startswith(excluded_prefix) for excluded_prefix in excluded)
+        ]
+        skipped_files = None
+        if parent.skipped_files is not None:
+            skipped_files = [
+                rel_path[len(prefix):] for rel_path in parent.skipped_files
+                if rel_path.startswith(prefix)
+                and not any(rel_path.startswith(excluded_prefix) for excluded_prefix in excluded)
+            ]
+
+        super().__init__(parent.repo_path / rel_dir, files, dirs, skipped_dirs, skipped_files)
+        self.parent = parent
+        self.rel_dir = rel_dir
+
+    def source(self, rel_path: str) -> Union[Path, BinaryIO]:
+        """Return the parent's source for a path of the view.
+
+        Args:
+            rel_path: Path relative to the view's root.
+
+        Returns:
+            Path or stream, as the parent index provides it.
+        """
+        return self.parent.source(f"{self.rel_dir}/{rel_path}" if self.rel_dir else rel_path)
+
+
+def open_index(repo_path: Path, ref: Optional[str] = None) -> Optional[RepositoryIndex]:
+    """Open the index backend a repository path needs, if not a work tree.
+
+    Args:
+        repo_path: Repository directory, bare repository or zip package.
+        ref: Detect this ref from git objects.
+
+    Returns:
+        GitObjectIndex when ref is given, ZipArchiveIndex for zip files
+        (by name or content),
+        otherwise None (work trees are indexed by the detector itself).
+
+    Raises:
+        ValueError: If the git repository, ref or archive cannot be read.
+    """
+    if ref:
+        return GitObjectIndex.build(repo_path, ref)
+    if repo_path.is_file() and (repo_path.suffix.lower() == ".zip" or zipfile.is_zipfile(repo_path)):
+        return ZipArchiveIndex.build(repo_path)
+    return None
+
+
+def _git_fingerprint(repo_path: Path) -> Optional[str]:
+    """Fingerprint a git checkout from its HEAD tree and working tree state.
+
+    The HEAD tree id covers committed content. Every path reported by
+    ``git status`` (modified, staged, untracked and ignored) adds its size and
+    mtime, so editing a dirty file again also changes the fingerprint.
+    Ignored files count because the detectors read them too (a manifest in
+    an ignored build/ directory, say); those below INDEX_SKIP_DIRS do not.
+
+    Args:
+        repo_path: Path to repository.
+
+    Returns:
+        Fingerprint string, or None if repo_path is not inside a git work tree
+        or git is unavailable.
+    """
+    try:
+        tree = subprocess.run(
+            ["git", "rev-parse", "HEAD^{tree}"],
+            cwd=repo_path, capture_output=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            [
+                "git", "status", "--porcelain=v1", "-z", "--untracked-files=all",
+                "--ignored=traditional", "--", ".",
+                *(f":(exclude,glob)**/{name}/**" for name in sorted(INDEX_SKIP_DIRS)),
+            ],
+            cwd=repo_path, capture_output=True, check=True
+        ).stdout
+        toplevel = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=repo_path, capture_output=True, check=True
+        ).stdout.decode("utf-8", "surrogateescape").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    digest = hashlib.sha256(tree)
+    entries = status.split(b"\0")
+    index = 0
+    while index < len(entries):
+        entry = entries[index]
+        index += 1
+        if len(entry) < 4:
+            continue
+        digest.update(entry)
+        # Renames and copies are followed by their source path
+        if entry[:1] in (b"R", b"C"):
+            index += 1
+        path = Path(toplevel) / os.fsdecode(entry[3:])
+        try:
+            stat = path.stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(b"missing")
+
+    return f"git:{digest.hexdigest()}"
+
+
+def repository_fingerprint(repo_path: Path, index: Optional[RepositoryIndex] = None) -> str:
+    """Compute a cheap fingerprint of the repository content detection depends on.
+
+    Git checkouts use the HEAD tree id plus dirty state; other trees use the
+    mtimes of directories and marker files (see RepositoryIndex.fingerprint).
+
+    Args:
+        repo_path: Path to repository.
+        index: Index of the repository, if already built.
+
+    Returns:
+        Fingerprint string that changes when detection results may change.
+    """
+    fingerprint = _git_fingerprint(repo_path)
+    if fingerprint is None:
+        if index is None:
+            index = RepositoryIndex.build(repo_path)
+        fingerprint = index.fingerprint()
+    return fingerprint
+
+
+class DetectionCache:
+    """SQLite store for platform detection results.
+
+    One database holds the results for every repository, keyed on the
+    SHA-256 of the repository path. Each entry stores the repository
+    fingerprint it was computed for and is ignored once the fingerprint
+    changes (see repository_fingerprint). Results are stored as JSON, so a
+    cache restored from a shared CI cache is never unpickled.
+
+    Entries expire after ttl seconds, and the least recently used entries
+    are evicted above max_entries. SQLite's file locking (with a busy
+    timeout) lets parallel jobs share the database; writes take the write
+    lock up front. The schema version includes __version__, so upgrading
+    the script discards old entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ) -> None:
         """Initialize detection cache.
 
         Args:
-            cache_dir: Directory for cache files. Defaults to ~/.cache/mokostudios.
+            cache_dir: Directory for the cache database. Defaults to
+                ~/.cache/mokostudios/platform_detection.
+            ttl: Maximum age of an entry in seconds.
+            max_entries: Maximum number of entries kept.
         """
         if cache_dir is None:
             cache_dir = Path.home() / ".cache" / "mokostudios" / "platform_detection"
 
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        self.conn = sqlite3.connect(
+            str(self.cache_dir / CACHE_DB_NAME), timeout=CACHE_LOCK_TIMEOUT, isolation_level=None
+        )
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        """Create the tables, dropping entries written by another schema version."""
+        schema = f"{CACHE_SCHEMA_VERSION}:{__version__}"
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if row is None or row[0] != schema:
+                self.conn.execute("DROP TABLE IF EXISTS entries")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (schema,)
+                )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, repo_path TEXT NOT NULL, fingerprint TEXT NOT NULL,"
+                " result TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self._rollback()
+            raise
+
+    def _rollback(self) -> None:
+        """Roll back the open transaction, if any, releasing the write lock.
+
+        Called for every exception, including the DetectionTimeout raised by
+        SIGALRM between BEGIN IMMEDIATE and COMMIT, so an interrupted write
+        never leaves the database locked.
+        """
+        if self.conn.in_transaction:
+            self.conn.execute("ROLLBACK")
 
     def _get_cache_key(self, repo_path: Path) -> str:
         """Generate cache key from repository path.
@@ -113,49 +974,234 @@ class DetectionCache:
         """
         return hashlib.sha256(str(repo_path).encode()).hexdigest()
 
-    def get(self, repo_path: Path) -> Optional[DetectionResult]:
+    def get(self, repo_path: Path, fingerprint: str) -> Optional[DetectionResult]:
         """Retrieve cached detection result.
 
         Args:
             repo_path: Path to repository.
+            fingerprint: Current repository fingerprint.
 
         Returns:
-            Cached DetectionResult if available, None otherwise.
+            Cached DetectionResult if available, unexpired and computed for
+            the same fingerprint, None otherwise.
         """
-        cache_file = self.cache_dir / f"{self._get_cache_key(repo_path)}.pkl"
-
-        if not cache_file.exists():
+        try:
+            row = self.conn.execute(
+                "SELECT fingerprint, result, created FROM entries WHERE key = ?",
+                (self._get_cache_key(repo_path),)
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        now = time.time()
+        if row is None or row[0] != fingerprint or now - row[2] > self.ttl:
+            self.stats["misses"] += 1
             return None
 
         try:
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
-        except (pickle.PickleError, OSError, EOFError):
+            result = DetectionResult.from_dict(json.loads(row[1]))
+            self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                (now, self._get_cache_key(repo_path))
+            )
+        except (ValueError, KeyError, TypeError):
+            self.stats["misses"] += 1
             return None
+        except sqlite3.Error:
+            pass
 
-    def set(self, repo_path: Path, result: DetectionResult) -> None:
-        """Store detection result in cache.
+        self.stats["hits"] += 1
+        return result
+
+    def set(self, repo_path: Path, fingerprint: str, result: DetectionResult) -> None:
+        """Store detection result in cache and evict expired or excess entries.
 
         Args:
             repo_path: Path to repository.
+            fingerprint: Repository fingerprint the result was computed for.
             result: Detection result to cache.
         """
-        cache_file = self.cache_dir / f"{self._get_cache_key(repo_path)}.pkl"
-
+        now = time.time()
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(result, f)
-        except (pickle.PickleError, OSError):
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self._get_cache_key(repo_path), str(repo_path), fingerprint,
+                        json.dumps(result.to_dict()), now, now
+                    )
+                )
+                self.stats["evictions"] += self._evict(now)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self._rollback()
+                raise
+        except sqlite3.Error:
             pass
 
+    def _evict(self, now: float) -> int:
+        """Delete expired entries and least recently used entries above max_entries.
+
+        Args:
+            now: Current time.
+
+        Returns:
+            Number of entries evicted.
+        """
+        expired = self.conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+        excess = self.conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            " SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        return expired.rowcount + excess.rowcount
+
     def clear(self) -> None:
         """Clear all cached detection results."""
+        try:
+            self.conn.execute("DELETE FROM entries")
+        except sqlite3.Error:
+            pass
+
+        # Remove files left by the pickle based cache
         for cache_file in self.cache_dir.glob("*.pkl"):
             try:
                 cache_file.unlink()
             except OSError:
                 pass
 
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+
+def _open_source(source: Union[Path, BinaryIO]):
+    """Open a path for binary reading, or use an already open stream as is."""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb")
+    return nullcontext(source)
+
+
+def sniff_xml_manifest(xml_file: Union[Path, BinaryIO]) -> Optional[Dict[str, str]]:
+    """Read just enough of an XML file to identify a Joomla manifest.
+
+    Files whose first bytes are not markup are skipped without parsing.
+    Parsing stops at the root element unless it is <extension> or <install>,
+    and otherwise as soon as the <version> and <name> children are seen.
+
+    Args:
+        xml_file: Path to XML file, or a seekable binary stream.
+
+    Returns:
+        Dictionary with the root "tag", its "type" attribute and the
+        "version" and "name" texts (empty when absent), or None if the file
+        is not XML or cannot be read.
+    """
+    try:
+        with _open_source(xml_file) as f:
+            head = f.read(XML_SNIFF_SIZE)
+            if not head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"<"):
+                return None
+            f.seek(0)
+
+            manifest = {"tag": "", "type": "", "version": "", "name": ""}
+            depth = 0
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        manifest["tag"] = elem.tag
+                        manifest["type"] = elem.get("type", "")
+                        if elem.tag not in ["extension", "install"]:
+                            break
+                    continue
+
+                depth -= 1
+                if depth == 1 and elem.tag in ("version", "name") and not manifest[elem.tag]:
+                    manifest[elem.tag] = (elem.text or "").strip()
+                    if manifest["version"] and manifest["name"]:
+                        break
+                elem.clear()
+
+            return manifest
+    except (ET.ParseError, OSError):
+        return None
+
+
+def scan_dolibarr_descriptor(path: Union[Path, BinaryIO]) -> Optional[Dict[str, str]]:
+    """Check whether a PHP file is a Dolibarr module descriptor.
+
+    The file is read in DESCRIPTOR_READ_SIZE chunks and all markers are
+    matched in a single pass. Only the new chunk and the last
+    DOLIBARR_SCAN_OVERLAP characters before it are searched, so the scan
+    stays linear in the file size. Reading stops once the marker threshold
+    is reached and the module class name is known; descriptors always
+    declare their class near the top, and without a class name the rest of
+    the file is needed to give the same result as a scan of the complete
+    file.
+
+    Args:
+        path: PHP file to scan, or a binary stream.
+
+    Returns:
+        Dictionary with "module_class" (None if not found) for descriptors,
+        otherwise None.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    markers = set()
+    first_class = None
+    tail = ""
+
+    try:
+        with _open_source(path) as handle:
+            while True:
+                chunk = handle.read(DESCRIPTOR_READ_SIZE)
+                eof = not chunk
+                window = tail + decoder.decode(chunk, final=eof)
+
+                for match in DOLIBARR_MARKER_PATTERN.finditer(window):
+                    markers.add(match.group(1))
+
+                keep = max(0, len(window) - DOLIBARR_SCAN_OVERLAP)
+                if first_class is None:
+                    match = DOLIBARR_CLASS_PATTERN.search(window)
+                    if match and (eof or match.end() < len(window)):
+                        first_class = match.group(1)
+                    elif match:
+                        # The class name may continue in the next chunk
+                        keep = min(keep, match.start())
+
+                if eof or (
+                    len(markers) >= DOLIBARR_DESCRIPTOR_THRESHOLD
+                    and "class mod" in markers and first_class is not None
+                ):
+                    break
+                tail = window[keep:]
+    except OSError:
+        return None
+
+    if len(markers) < DOLIBARR_DESCRIPTOR_THRESHOLD:
+        return None
+    return {"module_class": first_class if "class mod" in markers else None}
+
+
+@dataclass
+class Indicator:
+    """One piece of platform evidence, evaluated by PlatformDetector._run_indicators.
+
+    Attributes:
+        name: Short name shown by --explain.
+        cost: Relative evaluation cost (COST_LOOKUP or COST_CONTENT).
+        max_weight: Highest confidence the indicator can add.
+        evaluate: Returns (confidence added, indicator texts, metadata).
+    """
+
+    name: str
+    cost: int
+    max_weight: int
+    evaluate: Callable[[], Tuple[int, List[str], Dict[str, str]]]
+
 
 class PlatformDetector:
     """Detects repository platform type with enhanced detection algorithms.
@@ -164,20 +1210,39 @@ class PlatformDetector:
     with confidence scoring and detailed indicators.
     """
 
-    def __init__(self, repo_path: Path, use_cache: bool = False) -> None:
+    def __init__(
+        self,
+        repo_path: Path,
+        use_cache: bool = False,
+        cache: Optional[DetectionCache] = None,
+        index: Optional[RepositoryIndex] = None,
+    ) -> None:
         """Initialize platform detector.
 
         Args:
             repo_path: Path to repository to analyze.
             use_cache: Enable caching for performance optimization.
+            cache: Cache to use instead of the default one.
+            index: Index of the repository, if the caller already built one.
         """
         self.repo_path = Path(repo_path).resolve()
         self.use_cache = use_cache
-        self.cache = DetectionCache() if use_cache else None
+        self.cache = None
+        if use_cache:
+            self.cache = cache if cache is not None else DetectionCache()
+        self._index = index
+        self.trace: List[str] = []
 
         if not self.repo_path.exists():
             raise ValueError(f"Repository path does not exist: {self.repo_path}")
 
+    @property
+    def index(self) -> RepositoryIndex:
+        """Repository index shared by all detectors, built on first use."""
+        if self._index is None:
+            self._index = open_index(self.repo_path) or RepositoryIndex.build(self.repo_path)
+        return self._index
+
     def detect(self) -> DetectionResult:
         """Detect repository platform type.
 
@@ -186,32 +1251,173 @@ class PlatformDetector:
         2. Dolibarr detection (module.php, core/ structure)
         3. Generic fallback (confidence-based scoring)
 
+        Within a detector, indicators run cheapest first, and indicators
+        that can no longer lift the detector to the threshold are skipped
+        (see _run_indicators). The decisions taken are recorded in
+        self.trace.
+
         Returns:
             DetectionResult with platform type and confidence score.
         """
+        self.trace = []
+
+        fingerprint = None
         if self.use_cache and self.cache:
-            cached_result = self.cache.get(self.repo_path)
+            if isinstance(self._index, GitObjectIndex) or self.repo_path.is_file():
+                fingerprint = self.index.fingerprint()
+            else:
+                fingerprint = _git_fingerprint(self.repo_path) or self.index.fingerprint()
+            cached_result = self.cache.get(self.repo_path, fingerprint)
             if cached_result:
+                self.trace.append("cache: hit, no indicators evaluated")
                 return cached_result
 
-        joomla_result = self._detect_joomla()
-        if joomla_result.confidence >= 50:
+        joomla_result = self._detect_joomla(DETECTION_THRESHOLD)
+        if joomla_result.confidence >= DETECTION_THRESHOLD:
             if self.use_cache and self.cache:
-                self.cache.set(self.repo_path, joomla_result)
+                self.cache.set(self.repo_path, fingerprint, joomla_result)
             return joomla_result
 
-        dolibarr_result = self._detect_dolibarr()
-        if dolibarr_result.confidence >= 50:
+        dolibarr_result = self._detect_dolibarr(DETECTION_THRESHOLD)
+        if dolibarr_result.confidence >= DETECTION_THRESHOLD:
             if self.use_cache and self.cache:
-                self.cache.set(self.repo_path, dolibarr_result)
+                self.cache.set(self.repo_path, fingerprint, dolibarr_result)
             return dolibarr_result
 
         generic_result = self._detect_generic()
         if self.use_cache and self.cache:
-            self.cache.set(self.repo_path, generic_result)
+            self.cache.set(self.repo_path, fingerprint, generic_result)
         return generic_result
 
-    def _detect_joomla(self) -> DetectionResult:
+    def find_package_roots(self) -> List[str]:
+        """Find the package roots of a monorepo from the shared index.
+
+        A package root is a directory holding a Joomla manifest (as accepted
+        by _detect_joomla) or a Dolibarr module, i.e. the directory above
+        core/modules/ for a descriptor found there.
+
+        Returns:
+            Sorted relative paths of the package roots ("" is the repository
+            root).
+        """
+        roots = set()
+
+        for rel_path in self.index.files_with_suffix(".xml"):
+            if ".github" in rel_path.split("/"):
+                continue
+            manifest = sniff_xml_manifest(self.index.source(rel_path))
+            if (manifest is not None and manifest["tag"] in ["extension", "install"]
+                    and manifest["type"] in JOOMLA_EXTENSION_TYPES):
+                roots.add(rel_path.rpartition("/")[0])
+
+        for rel_path in self.index.files_with_suffix(".php"):
+            directory, _, name = rel_path.rpartition("/")
+            if not (name.startswith("mod") and name.endswith(".class.php")):
+                continue
+            if scan_dolibarr_descriptor(self.index.source(rel_path)) is None:
+                continue
+            marker = f"/{directory}/".find("/core/modules/")
+            if marker >= 0:
+                directory = directory[:max(marker - 1, 0)]
+            roots.add(directory)
+
+        return sorted(roots)
+
+    def detect_packages(self) -> List[Tuple[str, DetectionResult]]:
+        """Detect every package root of a monorepo separately.
+
+        The repository is traversed once; each root is then detected with
+        the usual detectors against a SubtreeIndex view that leaves out the
+        package roots nested below it, so a nested package's manifest is
+        never taken for the enclosing package's. Results are not cached.
+
+        Returns:
+            List of (package root, DetectionResult), sorted by root ("" is
+            the repository root).
+        """
+        packages = []
+        roots = self.find_package_roots()
+        for rel_dir in roots:
+            nested = [
+                root for root in roots
+                if root != rel_dir and (not rel_dir or root.startswith(f"{rel_dir}/"))
+            ]
+            index = self.index.subtree(rel_dir, nested) if rel_dir or nested else self.index
+            detector = PlatformDetector(self.repo_path, index=index)
+            packages.append((rel_dir, detector.detect()))
+        return packages
+
+    def _run_indicators(
+        self,
+        platform_type: PlatformType,
+        indicators: List[Indicator],
+        threshold: Optional[int] = None,
+        confidence: int = 0,
+        texts: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> DetectionResult:
+        """Evaluate a detector's indicators, cheapest first.
+
+        Once the confidence so far plus the maximum weight of the indicators
+        still pending is below threshold, the detector cannot reach it and
+        the pending indicators are skipped. A detector result below the
+        threshold is discarded by detect(), so skipping never changes its
+        output. Results are assembled in declaration order, as if every
+        indicator had run in that order.
+
+        Args:
+            platform_type: Platform the indicators are evidence for.
+            indicators: Indicators in declaration (output) order.
+            threshold: Confidence the result must reach to be used, or None
+                to evaluate every indicator.
+            confidence: Base confidence before any indicator.
+            texts: Base indicator texts.
+            metadata: Base metadata.
+
+        Returns:
+            DetectionResult for the platform.
+        """
+        name = platform_type.value
+        texts = list(texts or [])
+        metadata = dict(metadata or {})
+        outcomes: Dict[str, Tuple[int, List[str], Dict[str, str]]] = {}
+
+        score = confidence
+        pending = sum(indicator.max_weight for indicator in indicators)
+        for indicator in sorted(indicators, key=lambda indicator: indicator.cost):
+            if threshold is not None and score + pending < threshold:
+                self.trace.append(
+                    f"{name}: skipped {indicator.name} (cost {indicator.cost}): "
+                    f"at most {score + pending} < {threshold}"
+                )
+                continue
+
+            outcome = indicator.evaluate()
+            outcomes[indicator.name] = outcome
+            score += outcome[0]
+            pending -= indicator.max_weight
+            self.trace.append(
+                f"{name}: ran {indicator.name} (cost {indicator.cost}): "
+                f"+{outcome[0]} of at most +{indicator.max_weight}"
+            )
+
+        for indicator in indicators:
+            if indicator.name in outcomes:
+                gained, indicator_texts, indicator_metadata = outcomes[indicator.name]
+                confidence += gained
+                texts.extend(indicator_texts)
+                metadata.update(indicator_metadata)
+
+        self.trace.append(f"{name}: confidence {min(confidence, 100)}")
+
+        return DetectionResult(
+            platform_type=platform_type,
+            confidence=min(confidence, 100),
+            indicators=texts,
+            metadata=metadata
+        )
+
+    def _detect_joomla(self, threshold: Optional[int] = None) -> DetectionResult:
         """Detect Joomla component with enhanced manifest pattern matching.
 
         Detection criteria:
@@ -221,74 +1427,93 @@ class PlatformDetector:
             - Directory structure (site/, admin/, administrator/)
             - Language directories (language/en-GB/)
 
+        Args:
+            threshold: Confidence below which the result is not needed in
+                full (see _run_indicators).
+
         Returns:
             DetectionResult for Joomla platform with confidence score.
         """
-        confidence = 0
-        indicators: List[str] = []
-        metadata: Dict[str, str] = {}
-
-        manifest_patterns = ["**/*.xml"]
-        skip_dirs = {".git", "vendor", "node_modules", ".github"}
+        xml_files = [
+            rel_path for rel_path in self.index.files_with_suffix(".xml")
+            if ".github" not in rel_path.split("/")
+        ]
+        xml_files.sort(key=self._manifest_rank)
+
+        def manifest() -> Tuple[int, List[str], Dict[str, str]]:
+            confidence = 0
+            indicators: List[str] = []
+            metadata: Dict[str, str] = {}
+
+            for rel_path in xml_files:
+                manifest = sniff_xml_manifest(self.index.source(rel_path))
+                if manifest is None or manifest["tag"] not in ["extension", "install"]:
+                    continue
 
-        for xml_file in self.repo_path.glob("**/*.xml"):
-            if any(skip_dir in xml_file.parts for skip_dir in skip_dirs):
-                continue
+                ext_type = manifest["type"]
+                if ext_type in JOOMLA_EXTENSION_TYPES:
+                    confidence += 50
+                    indicators.append(f"Joomla manifest: {rel_path} (type={ext_type})")
+                    metadata["manifest_file"] = str(Path(rel_path))
+                    metadata["extension_type"] = ext_type
 
-            try:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
+                    if manifest["version"]:
+                        confidence += 10
+                        metadata["version"] = manifest["version"]
+                        indicators.append(f"Joomla version tag: {manifest['version']}")
 
-                if root.tag in ["extension", "install"]:
-                    ext_type = root.get("type", "")
+                    if manifest["name"]:
+                        metadata["extension_name"] = manifest["name"]
 
-                    if ext_type in ["component", "module", "plugin", "library", "template", "file"]:
-                        confidence += 50
-                        rel_path = xml_file.relative_to(self.repo_path)
-                        indicators.append(f"Joomla manifest: {rel_path} (type={ext_type})")
-                        metadata["manifest_file"] = str(rel_path)
-                        metadata["extension_type"] = ext_type
+                    break
 
-                        version_elem = root.find("version")
-                        if version_elem is not None and version_elem.text:
-                            confidence += 10
-                            metadata["version"] = version_elem.text.strip()
-                            indicators.append(f"Joomla version tag: {version_elem.text.strip()}")
+            return confidence, indicators, metadata
 
-                        name_elem = root.find("name")
-                        if name_elem is not None and name_elem.text:
-                            metadata["extension_name"] = name_elem.text.strip()
+        def directories() -> Tuple[int, List[str], Dict[str, str]]:
+            found = [name for name in ["site", "admin", "administrator"] if self.index.is_dir(name)]
+            return 15 * len(found), [f"Joomla directory structure: {name}/" for name in found], {}
 
-                        break
+        def language() -> Tuple[int, List[str], Dict[str, str]]:
+            if self.index.exists("language/en-GB"):
+                return 10, ["Joomla language directory: language/en-GB/"], {}
+            return 0, [], {}
 
-            except (ET.ParseError, OSError):
-                continue
+        def media() -> Tuple[int, List[str], Dict[str, str]]:
+            if self.index.has_file_below("media", ".css"):
+                return 5, ["Joomla media directory with assets"], {}
+            return 0, [], {}
 
-        joomla_dirs = ["site", "admin", "administrator"]
-        for dir_name in joomla_dirs:
-            if (self.repo_path / dir_name).is_dir():
-                confidence += 15
-                indicators.append(f"Joomla directory structure: {dir_name}/")
+        return self._run_indicators(PlatformType.JOOMLA, [
+            Indicator("manifest", COST_CONTENT, 60 if xml_files else 0, manifest),
+            Indicator("directories", COST_LOOKUP, 45, directories),
+            Indicator("language", COST_LOOKUP, 10, language),
+            Indicator("media", COST_LOOKUP, 5, media),
+        ], threshold)
 
-        if (self.repo_path / "language" / "en-GB").exists():
-            confidence += 10
-            indicators.append("Joomla language directory: language/en-GB/")
+    def _manifest_rank(self, rel_path: str) -> Tuple[int, int, str]:
+        """Sort key putting the usual Joomla manifest locations first.
 
-        media_dir = self.repo_path / "media"
-        if media_dir.is_dir() and list(media_dir.glob("**/*.css")):
-            confidence += 5
-            indicators.append("Joomla media directory with assets")
+        Order: templateDetails.xml at the root or in src/, src/*.xml, root
+        *.xml, then all other files by depth and path.
 
-        confidence = min(confidence, 100)
+        Args:
+            rel_path: Path of an XML file relative to the repository root.
 
-        return DetectionResult(
-            platform_type=PlatformType.JOOMLA,
-            confidence=confidence,
-            indicators=indicators,
-            metadata=metadata
-        )
+        Returns:
+            Tuple sorting lower for likelier manifests.
+        """
+        rel_parts = tuple(rel_path.split("/"))
+        if rel_parts[-1] == "templateDetails.xml" and rel_parts[:-1] in ((), ("src",)):
+            rank = 0
+        elif rel_parts[:-1] == ("src",):
+            rank = 1
+        elif len(rel_parts) == 1:
+            rank = 2
+        else:
+            rank = 3
+        return rank, len(rel_parts), rel_path
 
-    def _detect_dolibarr(self) -> DetectionResult:
+    def _detect_dolibarr(self, threshold: Optional[int] = None) -> DetectionResult:
         """Detect Dolibarr module with enhanced structure analysis.
 
         Detection criteria:
@@ -298,75 +1523,75 @@ class PlatformDetector:
             - SQL migration files in sql/
             - Class and lib directories
 
+        Args:
+            threshold: Confidence below which the result is not needed in
+                full (see _run_indicators).
+
         Returns:
             DetectionResult for Dolibarr platform with confidence score.
         """
-        confidence = 0
-        indicators: List[str] = []
-        metadata: Dict[str, str] = {}
-
-        descriptor_patterns = ["**/mod*.class.php", "**/core/modules/**/*.php"]
-        skip_dirs = {".git", "vendor", "node_modules"}
-
-        for pattern in descriptor_patterns:
-            for php_file in self.repo_path.glob(pattern):
-                if any(skip_dir in php_file.parts for skip_dir in skip_dirs):
-                    continue
-
-                try:
-                    content = php_file.read_text(encoding="utf-8", errors="ignore")
-
-                    dolibarr_patterns = [
-                        "extends DolibarrModules",
-                        "class mod",
-                        "$this->numero",
-                        "$this->rights_class",
-                        "DolibarrModules",
-                        "dol_include_once"
-                    ]
-
-                    pattern_matches = sum(1 for p in dolibarr_patterns if p in content)
-
-                    if pattern_matches >= 3:
-                        confidence += 60
-                        rel_path = php_file.relative_to(self.repo_path)
-                        indicators.append(f"Dolibarr module descriptor: {rel_path}")
-                        metadata["descriptor_file"] = str(rel_path)
-
-                        if "class mod" in content:
-                            import re
-                            match = re.search(r'class\s+(mod\w+)', content)
-                            if match:
-                                metadata["module_class"] = match.group(1)
-
-                        break
-
-                except (OSError, UnicodeDecodeError):
+        php_files = self.index.files_with_suffix(".php")
+        # **/mod*.class.php
+        class_files = [p for p in php_files if p.rpartition("/")[2].startswith("mod") and p.endswith(".class.php")]
+        # **/core/modules/**/*.php
+        module_files = [p for p in php_files if "/core/modules/" in f"/{p}"]
+
+        def descriptor(candidates: List[str]) -> Tuple[int, List[str], Dict[str, str]]:
+            for rel_path in sorted(candidates, key=self._descriptor_rank):
+                found = scan_dolibarr_descriptor(self.index.source(rel_path))
+                if found is None:
                     continue
 
-        dolibarr_dirs = ["core/modules", "sql", "class", "lib", "langs"]
-        for dir_name in dolibarr_dirs:
-            dir_path = self.repo_path / dir_name
-            if dir_path.exists():
-                confidence += 8
-                indicators.append(f"Dolibarr directory structure: {dir_name}/")
+                metadata = {"descriptor_file": str(Path(rel_path))}
+                if found["module_class"]:
+                    metadata["module_class"] = found["module_class"]
+                return 60, [f"Dolibarr module descriptor: {rel_path}"], metadata
+
+            return 0, [], {}
+
+        def directories() -> Tuple[int, List[str], Dict[str, str]]:
+            found = [
+                name for name in ["core/modules", "sql", "class", "lib", "langs"]
+                if self.index.exists(name)
+            ]
+            return 8 * len(found), [f"Dolibarr directory structure: {name}/" for name in found], {}
+
+        def sql() -> Tuple[int, List[str], Dict[str, str]]:
+            if self.index.is_dir("sql"):
+                sql_files = [p for p in self.index.files_with_suffix(".sql") if p.rpartition("/")[0] == "sql"]
+                if sql_files:
+                    return (
+                        10,
+                        [f"Dolibarr SQL files: {len(sql_files)} migration scripts"],
+                        {"sql_files_count": str(len(sql_files))},
+                    )
+            return 0, [], {}
+
+        return self._run_indicators(PlatformType.DOLIBARR, [
+            Indicator("class descriptor", COST_CONTENT, 60 if class_files else 0, partial(descriptor, class_files)),
+            Indicator("core/modules descriptor", COST_CONTENT, 60 if module_files else 0, partial(descriptor, module_files)),
+            Indicator("directories", COST_LOOKUP, 40, directories),
+            Indicator("sql", COST_LOOKUP, 10, sql),
+        ], threshold)
+
+    def _descriptor_rank(self, rel_path: str) -> Tuple[int, int, str]:
+        """Sort key putting the likeliest Dolibarr descriptors first.
+
+        Order: core/modules/mod*.class.php, other mod*.class.php files, then
+        all other files, each by depth and path.
 
-        sql_dir = self.repo_path / "sql"
-        if sql_dir.is_dir():
-            sql_files = list(sql_dir.glob("*.sql"))
-            if sql_files:
-                confidence += 10
-                indicators.append(f"Dolibarr SQL files: {len(sql_files)} migration scripts")
-                metadata["sql_files_count"] = str(len(sql_files))
-
-        confidence = min(confidence, 100)
+        Args:
+            rel_path: Path of a PHP file relative to the repository root.
 
-        return DetectionResult(
-            platform_type=PlatformType.DOLIBARR,
-            confidence=confidence,
-            indicators=indicators,
-            metadata=metadata
-        )
+        Returns:
+            Tuple sorting lower for likelier descriptors.
+        """
+        directory, _, name = rel_path.rpartition("/")
+        if name.startswith("mod") and name.endswith(".class.php"):
+            rank = 0 if f"/{directory}".endswith("/core/modules") else 1
+        else:
+            rank = 2
+        return rank, rel_path.count("/"), rel_path
 
     def _detect_generic(self) -> DetectionResult:
         """Fallback detection for generic repositories with confidence scoring.
@@ -377,43 +1602,590 @@ class PlatformDetector:
         Returns:
             DetectionResult for generic platform with confidence score.
         """
-        confidence = 50
-        indicators: List[str] = ["No platform-specific markers found"]
-        metadata: Dict[str, str] = {
-            "checked_platforms": "Joomla, Dolibarr",
-            "detection_reason": "Generic repository fallback"
-        }
+        def files() -> Tuple[int, List[str], Dict[str, str]]:
+            standard_files = ["README.md", "LICENSE", ".gitignore", "composer.json", "package.json"]
+            found_files = [name for name in standard_files if self.index.exists(name)]
+            if found_files:
+                return 5 * len(found_files), [f"Standard repository files: {', '.join(found_files)}"], {}
+            return 0, [], {}
+
+        def directories() -> Tuple[int, List[str], Dict[str, str]]:
+            standard_dirs = ["src", "tests", "docs", ".github"]
+            found_dirs = [name for name in standard_dirs if self.index.is_dir(name)]
+            if found_dirs:
+                return 3 * len(found_dirs), [f"Standard directory structure: {', '.join(found_dirs)}"], {}
+            return 0, [], {}
+
+        return self._run_indicators(
+            PlatformType.GENERIC,
+            [
+                Indicator("files", COST_LOOKUP, 25, files),
+                Indicator("directories", COST_LOOKUP, 12, directories),
+            ],
+            confidence=50,
+            texts=["No platform-specific markers found"],
+            metadata={
+                "checked_platforms": "Joomla, Dolibarr",
+                "detection_reason": "Generic repository fallback"
+            },
+        )
 
-        standard_files = ["README.md", "LICENSE", ".gitignore", "composer.json", "package.json"]
-        found_files = []
 
-        for file_name in standard_files:
-            if (self.repo_path / file_name).exists():
-                found_files.append(file_name)
-                confidence += 5
+class DetectionTimeout(Exception):
+    """Raised in a fleet worker when a repository exceeds its time limit."""
 
-        if found_files:
-            indicators.append(f"Standard repository files: {', '.join(found_files)}")
 
-        standard_dirs = ["src", "tests", "docs", ".github"]
-        found_dirs = []
+# Detection cache of the current fleet worker process (see _init_fleet_worker)
+_worker_cache: Optional[DetectionCache] = None
 
-        for dir_name in standard_dirs:
-            if (self.repo_path / dir_name).is_dir():
-                found_dirs.append(dir_name)
-                confidence += 3
 
-        if found_dirs:
-            indicators.append(f"Standard directory structure: {', '.join(found_dirs)}")
+def _init_fleet_worker(use_cache: bool, ttl: float, max_entries: int) -> None:
+    """Set up a fleet worker process once, before its first repository.
 
-        confidence = min(confidence, 100)
+    Args:
+        use_cache: Open the detection cache.
+        ttl: Cache entry lifetime in seconds.
+        max_entries: Maximum number of cache entries.
+    """
+    global _worker_cache
+    _worker_cache = None
+    if use_cache:
+        try:
+            _worker_cache = DetectionCache(ttl=ttl, max_entries=max_entries)
+        except (OSError, sqlite3.Error):
+            _worker_cache = None
 
-        return DetectionResult(
-            platform_type=PlatformType.GENERIC,
-            confidence=confidence,
-            indicators=indicators,
-            metadata=metadata
+
+def _raise_timeout(signum: int, frame: object) -> None:
+    """SIGALRM handler interrupting a detection that ran out of time."""
+    raise DetectionTimeout()
+
+
+def detect_repository(repo_path: str, timeout: Optional[float] = None, ref: Optional[str] = None) -> Dict[str, any]:
+    """Detect the platform of one fleet repository.
+
+    Never raises: failures and timeouts are reported in the record. The time
+    limit uses SIGALRM and is not enforced on platforms without it.
+
+    Args:
+        repo_path: Path to repository.
+        timeout: Maximum detection time in seconds, or None for no limit.
+        ref: Detect this ref from git objects instead of the work tree.
+
+    Returns:
+        Detection result dictionary with "repo_path" and "elapsed", or a
+        dictionary with "repo_path", "error" and "elapsed".
+    """
+    start = time.monotonic()
+    record: Dict[str, any] = {"repo_path": repo_path}
+
+    use_alarm = bool(timeout) and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    index = None
+    try:
+        index = open_index(Path(repo_path), ref)
+        detector = PlatformDetector(
+            Path(repo_path), use_cache=_worker_cache is not None, cache=_worker_cache, index=index
         )
+        record.update(detector.detect().to_dict())
+    except DetectionTimeout:
+        record["error"] = f"Detection timed out after {timeout} seconds"
+        record["timeout"] = True
+    except Exception as e:
+        record["error"] = str(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+        if index is not None:
+            index.close()
+
+    record["elapsed"] = round(time.monotonic() - start, 3)
+    return record
+
+
+def collect_fleet(
+    repo_paths: List[str], manifest: Optional[Path] = None, parent: Optional[Path] = None
+) -> List[str]:
+    """Build the list of repositories for fleet mode.
+
+    Args:
+        repo_paths: Repository paths given on the command line.
+        manifest: File listing one repository path per line ('#' starts a
+            comment; relative paths are relative to the file).
+        parent: Directory whose non-hidden subdirectories and zip packages
+            are repositories.
+
+    Returns:
+        Resolved repository paths in order, without duplicates.
+
+    Raises:
+        OSError: If the manifest or parent directory cannot be read.
+    """
+    paths = [Path(repo_path) for repo_path in repo_paths]
+
+    if manifest is not None:
+        for line in manifest.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                paths.append(manifest.parent / line)
+
+    if parent is not None:
+        paths.extend(
+            entry for entry in sorted(parent.iterdir())
+            if not entry.name.startswith(".")
+            and (entry.is_dir() or (entry.suffix == ".zip" and entry.is_file()))
+        )
+
+    return list(dict.fromkeys(str(path.resolve()) for path in paths))
+
+
+def iter_fleet_results(
+    repo_paths: List[str],
+    workers: int = 1,
+    timeout: Optional[float] = None,
+    use_cache: bool = False,
+    cache_ttl: float = CACHE_TTL,
+    cache_max_entries: int = CACHE_MAX_ENTRIES,
+    ref: Optional[str] = None,
+) -> Iterator[Dict[str, any]]:
+    """Detect many repositories, yielding records as they finish.
+
+    Worker processes are started once and reused, so interpreter start-up,
+    imports and the cache connection are paid per worker, not per repository.
+
+    Args:
+        repo_paths: Repository paths (see collect_fleet).
+        workers: Number of worker processes; 1 runs in this process.
+        timeout: Per-repository time limit in seconds.
+        use_cache: Use the detection cache.
+        cache_ttl: Cache entry lifetime in seconds.
+        cache_max_entries: Maximum number of cache entries.
+        ref: Detect this ref from git objects instead of the work trees.
+
+    Yields:
+        One record per repository (see detect_repository), in completion order.
+    """
+    init_args = (use_cache, cache_ttl, cache_max_entries)
+
+    if workers <= 1 or len(repo_paths) <= 1:
+        _init_fleet_worker(*init_args)
+        for repo_path in repo_paths:
+            yield detect_repository(repo_path, timeout, ref)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(repo_paths)),
+        initializer=_init_fleet_worker,
+        initargs=init_args,
+    ) as executor:
+        futures = {
+            executor.submit(detect_repository, repo_path, timeout, ref): repo_path
+            for repo_path in repo_paths
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"repo_path": futures[future], "error": f"Worker failed: {e}", "elapsed": 0.0}
+
+
+def run_fleet(records: Iterator[Dict[str, any]], stream: TextIO = sys.stdout) -> Dict[str, any]:
+    """Stream fleet records as JSON Lines, followed by a summary record.
+
+    Args:
+        records: Records from iter_fleet_results().
+        stream: Output stream.
+
+    Returns:
+        Fleet summary dictionary.
+    """
+    start = time.monotonic()
+    summary: Dict[str, any] = {
+        "total": 0,
+        "platforms": {platform.value: 0 for platform in PlatformType},
+        "errors": 0,
+        "timeouts": 0,
+    }
+
+    for record in records:
+        summary["total"] += 1
+        if "error" in record:
+            summary["errors"] += 1
+            if record.get("timeout"):
+                summary["timeouts"] += 1
+        else:
+            summary["platforms"][record["platform_type"]] += 1
+        stream.write(json.dumps(record) + "\n")
+        stream.flush()
+
+    summary["elapsed"] = round(time.monotonic() - start, 3)
+    summary["version"] = __version__
+    stream.write(json.dumps({"summary": summary}) + "\n")
+    stream.flush()
+    return summary
+
+
+class InotifyWatcher:
+    """Minimal inotify(7) binding through ctypes (Linux only)."""
+
+    def __init__(self) -> None:
+        """Create the inotify instance.
+
+        Raises:
+            OSError: If inotify is not available.
+        """
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            init = self._libc.inotify_init1
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, f"inotify not available: {e}")
+
+        self.fd = init(IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def add(self, path: Path) -> int:
+        """Watch a directory.
+
+        Args:
+            path: Directory to watch (not recursive).
+
+        Returns:
+            Watch descriptor; watching the same directory twice returns the
+            same descriptor.
+
+        Raises:
+            OSError: If the watch cannot be added (e.g. ENOSPC when the
+                fs.inotify.max_user_watches limit is reached).
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), ctypes.c_uint32(WATCH_MASK))
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), str(path))
+        return wd
+
+    def remove(self, wd: int) -> None:
+        """Stop watching a directory (errors for vanished watches are ignored)."""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> List[Tuple[int, int]]:
+        """Block until events arrive.
+
+        Returns:
+            List of (watch descriptor, event mask) pairs.
+        """
+        data = os.read(self.fd, 64 * 1024)
+        events = []
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+            events.append((wd, mask))
+            offset += INOTIFY_EVENT.size + name_length
+        return events
+
+    def close(self) -> None:
+        """Close the inotify instance."""
+        os.close(self.fd)
+
+
+class DetectionDaemon:
+    """Detection results held in memory and dropped when their tree changes.
+
+    Each repository is indexed with an inotify watch on every directory the
+    index walks, added before the directory is listed, so no change after
+    the walk starts can be missed. Any event in a watched directory drops
+    the repository's index and result; the next request scans it again.
+    Without inotify (or when the watch limit is reached) nothing is held
+    and every request runs a fresh detection.
+
+    At most max_repositories repositories and max_watches watches are held;
+    beyond that the least recently requested repository is dropped.
+    """
+
+    def __init__(
+        self,
+        watcher: Optional[InotifyWatcher] = None,
+        max_repositories: int = DAEMON_MAX_REPOSITORIES,
+        max_watches: int = DAEMON_MAX_WATCHES,
+    ) -> None:
+        """Initialize daemon state.
+
+        Args:
+            watcher: inotify instance, or None to hold no results.
+            max_repositories: Maximum number of repositories held.
+            max_watches: Maximum number of inotify watches held.
+        """
+        self.watcher = watcher
+        self.max_repositories = max_repositories
+        self.max_watches = max_watches
+        self.lock = threading.Lock()
+        # Repository path -> {"index", "result", "trace", "watches", "valid"},
+        # least recently requested first
+        self.repositories: Dict[str, Dict[str, any]] = {}
+        # Watch descriptor -> repositories using it (nested trees share watches)
+        self.watch_owners: Dict[int, Set[str]] = {}
+
+    def detect(self, repo_path: Path) -> Tuple[DetectionResult, List[str]]:
+        """Detect a repository, reusing the held result when its tree is unchanged.
+
+        Args:
+            repo_path: Resolved repository path.
+
+        Returns:
+            Tuple of (DetectionResult, detection trace).
+
+        Raises:
+            ValueError: If the repository path does not exist.
+        """
+        key = str(repo_path)
+        with self.lock:
+            entry = self.repositories.get(key)
+            if entry is not None and entry["result"] is not None:
+                # Move to the most recently used end
+                self.repositories[key] = self.repositories.pop(key)
+                return entry["result"], ["daemon: tree unchanged, no indicators evaluated"]
+
+            building = entry is not None
+            if not building:
+                entry = {"index": None, "result": None, "trace": [], "watches": [], "valid": self.watcher is not None}
+                self.repositories[key] = entry
+                while len(self.repositories) > self.max_repositories and self._evict(key):
+                    pass
+
+        if building or repo_path.is_file():
+            # Another request is indexing this tree, or it is a package that
+            # cannot be watched; answer without holding
+            detector = PlatformDetector(repo_path, use_cache=False)
+            try:
+                return detector.detect(), detector.trace
+            finally:
+                if detector._index is not None:
+                    detector._index.close()
+
+        def watch(dir_path: Path) -> None:
+            if not entry["valid"]:
+                return
+            with self.lock:
+                while len(self.watch_owners) >= self.max_watches and self._evict(key):
+                    pass
+                if len(self.watch_owners) >= self.max_watches:
+                    entry["valid"] = False
+                    return
+            try:
+                wd = self.watcher.add(dir_path)
+            except OSError:
+                entry["valid"] = False
+                return
+            with self.lock:
+                entry["watches"].append(wd)
+                self.watch_owners.setdefault(wd, set()).add(key)
+
+        try:
+            index = RepositoryIndex.build(repo_path, on_directory=watch)
+            detector = PlatformDetector(repo_path, use_cache=False, index=index)
+            result = detector.detect()
+        except Exception:
+            with self.lock:
+                self._drop(key, entry)
+            raise
+
+        with self.lock:
+            if entry["valid"] and self.repositories.get(key) is entry:
+                entry.update(index=index, result=result, trace=detector.trace)
+            else:
+                self._drop(key, entry)
+        return result, detector.trace
+
+    def handle_events(self, events: List[Tuple[int, int]]) -> None:
+        """Drop the repositories affected by inotify events.
+
+        Args:
+            events: (watch descriptor, mask) pairs from InotifyWatcher.read().
+        """
+        with self.lock:
+            for wd, mask in events:
+                if mask & IN_Q_OVERFLOW:
+                    affected = set(self.repositories)
+                else:
+                    affected = set(self.watch_owners.get(wd, ()))
+                for key in affected:
+                    entry = self.repositories.get(key)
+                    if entry is not None:
+                        self._drop(key, entry)
+
+    def _evict(self, keep: str) -> bool:
+        """Drop the least recently requested repository other than keep (lock held).
+
+        Returns:
+            False if there was no other repository to drop.
+        """
+        for key, entry in self.repositories.items():
+            if key != keep:
+                self._drop(key, entry)
+                return True
+        return False
+
+    def _drop(self, key: str, entry: Dict[str, any]) -> None:
+        """Forget a repository and release its watches (lock held)."""
+        entry["valid"] = False
+        if self.repositories.get(key) is entry:
+            del self.repositories[key]
+
+        for wd in entry["watches"]:
+            owners = self.watch_owners.get(wd)
+            if owners is None:
+                continue
+            owners.discard(key)
+            if not owners:
+                del self.watch_owners[wd]
+                self.watcher.remove(wd)
+        entry["watches"] = []
+
+    def watch_events(self) -> None:
+        """Process inotify events until the watcher is closed."""
+        while True:
+            try:
+                events = self.watcher.read()
+            except OSError:
+                return
+            self.handle_events(events)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one request: a JSON line in, a JSON line out."""
+
+    def handle(self) -> None:
+        """Answer {"repo_path": ...} with {"result", "trace", "version"} or {"error": ...}."""
+        try:
+            request = json.loads(self.rfile.readline())
+            repo_path = Path(request["repo_path"]).resolve()
+            result, trace = self.server.detection_daemon.detect(repo_path)
+            response = {"result": result.to_dict(), "trace": trace, "version": __version__}
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"error": str(e)}
+        except Exception as e:
+            response = {"error": f"Unexpected error: {str(e)}"}
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server carrying a DetectionDaemon."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: DetectionDaemon) -> None:
+        """Bind the socket (readable by the current user only).
+
+        Args:
+            socket_path: Path of the Unix socket.
+            daemon: Daemon answering the requests.
+        """
+        self.detection_daemon = daemon
+        super().__init__(str(socket_path), DaemonRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+
+def serve(socket_path: Path) -> int:
+    """Run the detection daemon until interrupted.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on.
+
+    Returns:
+        Exit code.
+    """
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly
+                socket_path.unlink()
+            else:
+                print(f"✗ Error: a daemon is already listening on {socket_path}", file=sys.stderr)
+                return 2
+
+    try:
+        watcher = InotifyWatcher()
+    except OSError as e:
+        print(f"⚠ Warning: {e}; results are not held between requests", file=sys.stderr)
+        watcher = None
+
+    daemon = DetectionDaemon(watcher)
+    if watcher is not None:
+        threading.Thread(target=daemon.watch_events, daemon=True).start()
+
+    server = DaemonServer(socket_path, daemon)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Platform detection daemon v{__version__} listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        if watcher is not None:
+            watcher.close()
+    return 0
+
+
+def run_packages(repo_path: Path, ref: Optional[str] = None, as_json: bool = False, verbose: bool = False) -> int:
+    """Detect and print every package root of a monorepo.
+
+    Args:
+        repo_path: Repository directory, bare repository or zip package.
+        ref: Detect this ref from git objects.
+        as_json: Print JSON instead of text.
+        verbose: Include indicators and metadata in text output.
+
+    Returns:
+        Exit code.
+    """
+    index = open_index(repo_path, ref)
+    try:
+        packages = PlatformDetector(repo_path, index=index).detect_packages()
+    finally:
+        if index is not None:
+            index.close()
+
+    if as_json:
+        output = {
+            "repo_path": str(repo_path),
+            "version": __version__,
+            "packages": [
+                {"package_path": rel_dir or ".", **result.to_dict()} for rel_dir, result in packages
+            ],
+        }
+        print(json.dumps(output, indent=2))
+        return 0
+
+    print("=" * 70)
+    print(f"Platform Auto-Detection v{__version__}")
+    print("=" * 70)
+    print()
+    print(f"📁 Repository: {repo_path}")
+    print(f"📦 Packages: {len(packages)}")
+    print()
+
+    for rel_dir, result in packages:
+        print(f"   • {rel_dir or '.'}: {result.platform_type.value.upper()} ({result.confidence}%)")
+        if verbose:
+            for indicator in result.indicators:
+                print(f"        {indicator}")
+            for key, value in result.metadata.items():
+                print(f"        {key}: {value}")
+
+    if packages:
+        print()
+    print("=" * 70)
+    return 0
 
 
 def main() -> int:
@@ -429,8 +2201,57 @@ def main() -> int:
     parser.add_argument(
         "--repo-path",
         type=str,
-        default=".",
-        help="Path to repository to analyze (default: current directory)"
+        nargs="+",
+        help="Path to repository or zip package to analyze (default: current "
+             "directory); several paths run fleet mode"
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Fleet mode: file listing one repository path per line"
+    )
+    parser.add_argument(
+        "--parent",
+        type=Path,
+        help="Fleet mode: directory whose subdirectories and zip packages are repositories"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Fleet mode: number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Fleet mode: time limit per repository (default: none)"
+    )
+    parser.add_argument(
+        "--ref",
+        metavar="REF",
+        help="Detect REF from git objects without reading a work tree "
+             "(works on bare repositories)"
+    )
+    parser.add_argument(
+        "--packages",
+        action="store_true",
+        help="Detect each package root (directory with a Joomla manifest or "
+             "Dolibarr module) separately, in one traversal"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a resident daemon answering detection requests on --socket"
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_SOCKET_PATH,
+        metavar="PATH",
+        help=f"Ask the daemon listening on PATH (default: {DEFAULT_SOCKET_PATH}), "
+             "or with --serve, listen there; falls back to detecting in-process"
     )
     parser.add_argument(
         "--json",
@@ -442,11 +2263,30 @@ def main() -> int:
         action="store_true",
         help="Enable verbose output with detailed indicators"
     )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Show which indicators were evaluated or skipped, cheapest first"
+    )
     parser.add_argument(
         "--cache",
         action="store_true",
         help="Enable caching for performance (stores results in ~/.cache/mokostudios)"
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=CACHE_TTL,
+        metavar="SECONDS",
+        help=f"Maximum age of cached results (default: {CACHE_TTL})"
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=CACHE_MAX_ENTRIES,
+        metavar="N",
+        help=f"Maximum number of cached repositories (default: {CACHE_MAX_ENTRIES})"
+    )
     parser.add_argument(
         "--clear-cache",
         action="store_true",
@@ -463,12 +2303,29 @@ def main() -> int:
     if args.clear_cache:
         cache = DetectionCache()
         cache.clear()
+        cache.close()
         if not args.json:
             print("✓ Detection cache cleared")
         return 0
 
+    if args.serve:
+        return serve(args.socket or DEFAULT_SOCKET_PATH)
+
+    if (args.repo_path and len(args.repo_path) > 1) or args.manifest or args.parent:
+        try:
+            repo_paths = collect_fleet(args.repo_path or [], args.manifest, args.parent)
+        except OSError as e:
+            print(json.dumps({"error": f"Cannot read fleet: {e}"}))
+            return 2
+
+        summary = run_fleet(iter_fleet_results(
+            repo_paths, args.workers, args.timeout, args.cache, args.cache_ttl, args.cache_max_entries,
+            args.ref
+        ))
+        return 1 if summary["errors"] else 0
+
     try:
-        repo_path = Path(args.repo_path).resolve()
+        repo_path = Path(args.repo_path[0] if args.repo_path else ".").resolve()
 
         if not repo_path.exists():
             if args.json:
@@ -477,13 +2334,51 @@ def main() -> int:
                 print(f"✗ Error: Repository path does not exist: {repo_path}", file=sys.stderr)
             return 2
 
-        detector = PlatformDetector(repo_path, use_cache=args.cache)
-        result = detector.detect()
+        if args.packages:
+            return run_packages(repo_path, args.ref, args.json, args.verbose)
+
+        response = None
+        # The daemon watches work trees, so git objects and packages are detected in-process
+        if args.socket and not args.ref and not repo_path.is_file():
+            try:
+                response = query_daemon(args.socket, repo_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠ Warning: detection daemon unavailable ({e}); detecting in-process", file=sys.stderr)
+            else:
+                if "error" in response:
+                    raise ValueError(response["error"])
+
+        cache = None
+        if response is not None:
+            result = DetectionResult.from_dict(response["result"])
+            trace = response["trace"]
+        else:
+            if args.cache:
+                try:
+                    cache = DetectionCache(ttl=args.cache_ttl, max_entries=args.cache_max_entries)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"⚠ Warning: detection cache disabled: {e}", file=sys.stderr)
+
+            index = None
+            try:
+                index = open_index(repo_path, args.ref)
+                detector = PlatformDetector(repo_path, use_cache=cache is not None, cache=cache, index=index)
+                result = detector.detect()
+                trace = detector.trace
+            finally:
+                if index is not None:
+                    index.close()
+                if cache is not None:
+                    cache.close()
 
         if args.json:
             output = result.to_dict()
             output["repo_path"] = str(repo_path)
             output["version"] = __version__
+            if args.verbose and cache is not None:
+                output["cache"] = cache.stats
+            if args.explain:
+                output["explain"] = trace
             print(json.dumps(output, indent=2))
         else:
             print("=" * 70)
@@ -507,8 +2402,19 @@ def main() -> int:
                     print(f"   {key}: {value}")
                 print()
 
-            if args.cache:
+            if args.explain:
+                print("Detection Trace:")
+                for step in trace:
+                    print(f"   {step}")
+                print()
+
+            if cache is not None:
                 print("💾 Result cached for future runs")
+                if args.verbose:
+                    print(
+                        f"   Cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses, "
+                        f"{cache.stats['evictions']} evictions"
+                    )
                 print()
 
             print("=" * 70)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Thin client for the platform detection daemon.
+
+Starting auto_detect_platform.py costs more than asking a running daemon
+(see ``auto_detect_platform.py --serve``), so CI agents that only need a
+JSON answer use this entry point instead. It imports nothing beyond json
+and socket. Anything it cannot answer from the daemon (other options, text
+output, zip packages, an unreachable daemon or an error response) is handed
+to auto_detect_platform.py with the same arguments, which detects
+in-process.
+
+Usage:
+    python3 detect_platform_client.py [--socket [PATH]] [--repo-path PATH] [--json] [--explain]
+"""
+
+import json
+import os
+import socket
+import sys
+
+# Kept in sync with auto_detect_platform.py, which imports them from here
+DEFAULT_SOCKET_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "mokostudios", "platform_detection", "daemon.sock"
+)
+DAEMON_TIMEOUT = 30.0
+
+# The full detector, used for everything the client does not answer itself
+DETECTOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "auto_detect_platform.py")
+
+
+def query_daemon(socket_path, repo_path, timeout: float = DAEMON_TIMEOUT) -> dict:
+    """Ask a running daemon to detect a repository.
+
+    Args:
+        socket_path: Path of the daemon's Unix socket.
+        repo_path: Repository to detect.
+        timeout: Socket timeout in seconds.
+
+    Returns:
+        Daemon response ({"result", "trace", "version"} or {"error"}).
+
+    Raises:
+        OSError: If the daemon cannot be reached.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps({"repo_path": str(repo_path)}).encode() + b"\n")
+        with client.makefile("rb") as stream:
+            line = stream.readline()
+
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    return json.loads(line)
+
+
+def parse_args(argv: list):
+    """Parse the options the client answers itself.
+
+    Args:
+        argv: Command line arguments without the program name.
+
+    Returns:
+        Dictionary with "socket", "repo_path", "json" and "explain", or None
+        if argv holds anything else.
+    """
+    options = {"socket": DEFAULT_SOCKET_PATH, "repo_path": ".", "json": False, "explain": False}
+    position = 0
+    while position < len(argv):
+        arg = argv[position]
+        position += 1
+        if arg in ("--json", "--explain"):
+            options[arg[2:]] = True
+        elif arg == "--socket":
+            if position < len(argv) and not argv[position].startswith("-"):
+                options["socket"] = argv[position]
+                position += 1
+        elif arg == "--repo-path" and position < len(argv) and not argv[position].startswith("-"):
+            options["repo_path"] = argv[position]
+            position += 1
+        else:
+            return None
+    return options if options["json"] else None
+
+
+def main() -> int:
+    """Answer from the daemon, or run the full detector with the same arguments.
+
+    Returns:
+        Exit code (see auto_detect_platform.py).
+    """
+    options = parse_args(sys.argv[1:])
+    if options is not None:
+        repo_path = os.path.realpath(options["repo_path"])
+        if os.path.isdir(repo_path):
+            try:
+                response = query_daemon(options["socket"], repo_path)
+            except (OSError, ValueError):
+                response = None
+            if response is not None and "error" not in response and "version" in response:
+                output = response["result"]
+                output["repo_path"] = repo_path
+                output["version"] = response["version"]
+                if options["explain"]:
+                    output["explain"] = response["trace"]
+                print(json.dumps(output, indent=2))
+                return 0
+
+    argv = [sys.executable, DETECTOR_SCRIPT, *sys.argv[1:]]
+    if options is not None and "--socket" not in argv:
+        argv.append("--socket")
+    sys.stdout.flush()
+    os.execv(sys.executable, argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
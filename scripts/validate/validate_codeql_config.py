@@ -29,9 +29,19 @@ BRIEF: Validates CodeQL workflow language configuration matches repository conte
 """
 
 import argparse
+import hashlib
+import json
+import os
+import re
 import sys
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     import yaml
@@ -39,6 +49,23 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lib'))
+
+from build_variants import build_variant_source  # noqa: E402
+from repo_walker import FileEntry, IgnoreRule, walk_repository  # noqa: E402
+
+# Use the libyaml based loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bump when the data extracted from workflows changes shape
+WORKFLOW_CACHE_VERSION = 2
+
+# Maximum number of parsed workflows kept in the cache
+WORKFLOW_CACHE_MAX_ENTRIES = 5000
+
+# Default location of the parsed-workflow cache
+DEFAULT_WORKFLOW_CACHE_PATH = Path.home() / '.cache' / 'mokostudios' / 'codeql_workflows' / 'workflows.json'
+
 
 # Language to file extension mapping
 LANGUAGE_EXTENSIONS = {
@@ -52,37 +79,274 @@ LANGUAGE_EXTENSIONS = {
     'csharp': {'.cs'},
 }
 
+# Directory names that hold third-party code
+VENDOR_DIR_NAMES = {
+    'vendor', 'vendors', 'third_party', 'third-party', 'thirdparty',
+    'bower_components', 'node_modules', 'external',
+}
+
+# File names of minified build output (e.g. jquery.min.js, app-min.js)
+MINIFIED_NAME_PATTERN = re.compile(r'[.-]min\.[^.]+$')
+
+# File names of generated code; build variants such as menu-es5.js or
+# app.bundle.js are only generated when their source sits next to them (see
+# build_variants.build_variant_source), since hand-written legacy sources use
+# those names too
+GENERATED_NAME_PATTERN = re.compile(r'(?:\.pb|_pb2)\.[^.]+$')
+
+# Markers near the top of a file that identify generated code
+GENERATED_MARKERS = (b'@generated', b'DO NOT EDIT', b'AUTO-GENERATED', b'AUTOGENERATED')
+
+# Number of bytes read from the top of a file for content heuristics
+SNIFF_SIZE = 4096
+
+# Number of bytes at the top of a file searched for generated-code markers
+GENERATED_WINDOW = 1000
+
+# Lines at least this long make up most of the first block of a minified file
+MINIFIED_LINE_LENGTH = 500
+
+# The repository's copyright header; files that carry it are first-party code
+COPYRIGHT_HEADER_MARKERS = (b'Copyright (C)', b'Moko Consulting')
+
+# Source files larger than this are treated as generated
+MAX_SOURCE_SIZE = 1024 * 1024
+
+# Block size used when counting lines
+READ_BLOCK_SIZE = 64 * 1024
+
+# Languages with a smaller share of the non-blank lines (in percent), or
+# fewer lines, are reported as info rather than as missing from CodeQL
+MIN_LANGUAGE_SHARE = 1.0
+MIN_LANGUAGE_LINES = 50
+
+# Default location of a CodeQL configuration file written by --emit-config
+DEFAULT_CODEQL_CONFIG_PATH = Path('.github') / 'codeql' / 'codeql-config.yml'
+
+
+# Directories skipped when scanning for source files
+DEFAULT_EXCLUDE_DIRS = {'.git', 'vendor', 'node_modules', '.venv', 'venv', '__pycache__'}
+
+# File extension to language mapping (inverse of LANGUAGE_EXTENSIONS)
+EXTENSION_LANGUAGES = {
+    ext: language
+    for language, extensions in LANGUAGE_EXTENSIONS.items()
+    for ext in extensions
+}
+
+
+def language_source_files(
+    repo_path: Path,
+    exclude_dirs: Set[str] = None,
+    files: Optional[Iterable[FileEntry]] = None,
+) -> Iterable[FileEntry]:
+    """
+    Return the files languages are detected and measured from.
+
+    detect_languages_in_repo and measure_languages both use this, so they
+    always agree: .gitignore is honoured and excluded directories are
+    skipped, whether the repository is walked here or files come from
+    checkout_files.
+
+    Args:
+        repo_path: Path to the repository root
+        exclude_dirs: Set of directory names to exclude from scanning
+        files: Files already found by checkout_files
+
+    Returns:
+        The files outside exclude_dirs
+    """
+    if exclude_dirs is None:
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+
+    if files is None:
+        return walk_repository(repo_path, exclude_dirs)
+    return (
+        file for file in files
+        if exclude_dirs.isdisjoint(file.rel_path.split('/')[:-1])
+    )
+
+
+def extension_histogram(
+    repo_path: Path,
+    exclude_dirs: Set[str] = None,
+    files: Optional[Iterable[FileEntry]] = None,
+) -> Counter:
+    """
+    Count files per extension in a single pruned walk of the repository.
+
+    Args:
+        repo_path: Path to the repository root
+        exclude_dirs: Set of directory names to exclude from scanning
+        files: Files already found by checkout_files (see language_source_files)
+
+    Returns:
+        Counter mapping file extensions (including the dot) to file counts
+    """
+    histogram = Counter()
+    for file in language_source_files(repo_path, exclude_dirs, files):
+        name = file.name
+        dot = name.rfind('.')
+        if dot != -1:
+            histogram[name[dot:]] += 1
+    return histogram
+
+
+def languages_from_histogram(histogram: Counter) -> Dict[str, int]:
+    """
+    Map an extension histogram to per-language file counts.
+
+    Args:
+        histogram: Counter from extension_histogram()
+
+    Returns:
+        Dictionary mapping language names to file counts
+    """
+    language_counts = Counter()
+    for ext, count in histogram.items():
+        language = EXTENSION_LANGUAGES.get(ext)
+        if language is not None:
+            language_counts[language] += count
+
+    # Keep the LANGUAGE_EXTENSIONS order
+    return {
+        language: language_counts[language]
+        for language in LANGUAGE_EXTENSIONS
+        if language_counts[language] > 0
+    }
+
 
-def detect_languages_in_repo(repo_path: Path, exclude_dirs: Set[str] = None) -> Dict[str, int]:
+def detect_languages_in_repo(
+    repo_path: Path,
+    exclude_dirs: Set[str] = None,
+    files: Optional[Iterable] = None,
+) -> Dict[str, int]:
     """
     Detect programming languages present in the repository by scanning file extensions.
 
+    The tree is walked once, pruning excluded directories, and the extension
+    histogram is mapped to languages. The files are those measure_languages
+    uses (see language_source_files).
+
     Args:
         repo_path: Path to the repository root
         exclude_dirs: Set of directory names to exclude from scanning
+        files: Files already found by checkout_files. When given, the
+            repository is not scanned again.
 
     Returns:
         Dictionary mapping language names to file counts
     """
-    if exclude_dirs is None:
-        exclude_dirs = {'.git', 'vendor', 'node_modules', '.venv', 'venv', '__pycache__'}
+    return languages_from_histogram(extension_histogram(repo_path, exclude_dirs, files))
+
+
+@dataclass
+class LanguageStats:
+    """Size of one language in a repository."""
+
+    files: int = 0
+    bytes: int = 0
+    lines: int = 0
+
+
+def count_code_lines(filepath: Path) -> int:
+    """
+    Count the non-blank lines of a file.
+
+    The file is read in blocks; only the blankness of a line that spans
+    blocks is carried over, so memory use does not depend on line length.
+    """
+    count = 0
+    carry = b''
+    with open(filepath, 'rb') as f:
+        for block in iter(partial(f.read, READ_BLOCK_SIZE), b''):
+            lines = block.split(b'\n')
+            lines[0] = carry + lines[0]
+            carry = b'x' if lines.pop().strip() else b''
+            count += sum(1 for line in lines if line.strip())
+    if carry:
+        count += 1
+    return count
+
+
+def checkout_files(repo_path: Path) -> List[FileEntry]:
+    """
+    List the files of a repository honouring .gitignore, i.e. roughly the
+    files a CI checkout contains, vendored directories included.
+
+    main walks once and passes the list to detect_languages_in_repo,
+    measure_languages and analyze_exclusions, so detected languages, their
+    shares and exclusions are computed over the same files.
+    """
+    return list(walk_repository(repo_path, {'.git'}))
 
-    language_counts = {}
 
-    for language, extensions in LANGUAGE_EXTENSIONS.items():
-        count = 0
-        for ext in extensions:
-            for file_path in repo_path.rglob(f'*{ext}'):
-                # Skip excluded directories
-                if any(excluded in file_path.parts for excluded in exclude_dirs):
-                    continue
-                if file_path.is_file():
-                    count += 1
+def measure_languages(
+    repo_path: Path,
+    exclude_dirs: Set[str] = None,
+    files: Optional[Iterable[FileEntry]] = None,
+) -> Dict[str, LanguageStats]:
+    """
+    Total the files, bytes and non-blank lines of each language in one walk.
+
+    The files are those detect_languages_in_repo uses (see
+    language_source_files).
+
+    Args:
+        repo_path: Path to the repository root
+        exclude_dirs: Set of directory names to exclude from scanning
+        files: Files already found by checkout_files
+
+    Returns:
+        Dictionary mapping language names to their totals, in
+        LANGUAGE_EXTENSIONS order
+    """
+    stats: Dict[str, LanguageStats] = {}
+    for file in language_source_files(repo_path, exclude_dirs, files):
+        dot = file.name.rfind('.')
+        language = EXTENSION_LANGUAGES.get(file.name[dot:]) if dot != -1 else None
+        if language is None:
+            continue
 
-        if count > 0:
-            language_counts[language] = count
+        totals = stats.setdefault(language, LanguageStats())
+        totals.files += 1
+        try:
+            totals.bytes += file.size
+            totals.lines += count_code_lines(file.path)
+        except OSError as e:
+            print(f"Warning: cannot read {file.rel_path}: {e}", file=sys.stderr)
 
-    return language_counts
+    return {language: stats[language] for language in LANGUAGE_EXTENSIONS if language in stats}
+
+
+def language_share(stats: Dict[str, LanguageStats], language: str) -> float:
+    """Return a language's share of all non-blank source lines, in percent."""
+    total = sum(totals.lines for totals in stats.values())
+    if total == 0:
+        return 0.0
+    return 100.0 * stats[language].lines / total
+
+
+def minor_languages(
+    stats: Dict[str, LanguageStats],
+    min_share: float = MIN_LANGUAGE_SHARE,
+    min_lines: int = MIN_LANGUAGE_LINES,
+) -> Set[str]:
+    """
+    Find the languages too small to require CodeQL analysis.
+
+    Args:
+        stats: Result of measure_languages()
+        min_share: Minimum share of non-blank lines, in percent
+        min_lines: Minimum number of non-blank lines
+
+    Returns:
+        Set of languages below either threshold
+    """
+    return {
+        language for language, totals in stats.items()
+        if totals.lines < min_lines or language_share(stats, language) < min_share
+    }
 
 
 def parse_codeql_workflow(workflow_path: Path) -> Tuple[List[str], bool]:
@@ -97,7 +361,7 @@ def parse_codeql_workflow(workflow_path: Path) -> Tuple[List[str], bool]:
     """
     try:
         with open(workflow_path, 'r') as f:
-            workflow = yaml.safe_load(f)
+            workflow = yaml.load(f, Loader=YAML_LOADER)
 
         # Navigate to the matrix.language configuration
         jobs = workflow.get('jobs', {})
@@ -115,13 +379,652 @@ def parse_codeql_workflow(workflow_path: Path) -> Tuple[List[str], bool]:
         return [], False
 
 
-def validate_codeql_config(repo_path: Path, workflow_path: Path) -> Tuple[bool, List[str], List[str]]:
+def as_language_list(value: Any) -> List[str]:
+    """Normalise a language setting (list, or comma separated string) to a list.
+
+    Expressions such as ``${{ matrix.language }}`` are dropped; they refer to
+    values found elsewhere.
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list):
+        return []
+    return [
+        str(item).strip() for item in value
+        if str(item).strip() and '${{' not in str(item)
+    ]
+
+
+def extract_codeql_languages(workflow: Any) -> Dict[str, List[str]]:
+    """
+    Extract the CodeQL languages configured by every job of a workflow.
+
+    Languages are taken from ``strategy.matrix.language``, ``language`` keys
+    of ``strategy.matrix.include`` entries and the ``languages`` input of
+    ``github/codeql-action/init`` steps (or of a job calling a reusable
+    workflow).
+
+    Args:
+        workflow: Parsed workflow document
+
+    Returns:
+        Dictionary mapping the name of each CodeQL job to its languages, in
+        configuration order
+    """
+    result = {}
+    if not isinstance(workflow, dict) or not isinstance(workflow.get('jobs'), dict):
+        return result
+
+    for job_name, job_config in workflow['jobs'].items():
+        if not isinstance(job_config, dict):
+            continue
+
+        languages = []
+        uses_codeql = False
+
+        strategy = job_config.get('strategy')
+        matrix = strategy.get('matrix') if isinstance(strategy, dict) else None
+        if isinstance(matrix, dict):
+            languages.extend(as_language_list(matrix.get('language')))
+            include = matrix.get('include')
+            if isinstance(include, list):
+                for entry in include:
+                    if isinstance(entry, dict):
+                        languages.extend(as_language_list(entry.get('language')))
+
+        steps = job_config.get('steps')
+        for step in [job_config] + (steps if isinstance(steps, list) else []):
+            if not isinstance(step, dict):
+                continue
+            uses = step.get('uses')
+            if isinstance(uses, str) and 'codeql' in uses:
+                uses_codeql = True
+            step_inputs = step.get('with')
+            if isinstance(step_inputs, dict) and isinstance(uses, str) and (
+                uses.startswith('github/codeql-action/init') or step is job_config
+            ):
+                languages.extend(as_language_list(step_inputs.get('languages')))
+
+        if languages or uses_codeql:
+            result[str(job_name)] = list(dict.fromkeys(languages))
+
+    return result
+
+
+def extract_codeql_configs(workflow: Any) -> List[Dict[str, str]]:
+    """
+    Extract the ``config`` and ``config-file`` inputs of every CodeQL init step.
+
+    Jobs that call a reusable workflow are listed as {'workflow': uses}, as
+    the configuration is not visible from the caller.
+
+    Args:
+        workflow: Parsed workflow document
+
+    Returns:
+        List of dicts holding the 'config' and/or 'config-file' values of each step
+    """
+    configs = []
+    if not isinstance(workflow, dict) or not isinstance(workflow.get('jobs'), dict):
+        return configs
+
+    for job_config in workflow['jobs'].values():
+        if isinstance(job_config, dict) and isinstance(job_config.get('uses'), str):
+            configs.append({'workflow': job_config['uses']})
+        steps = job_config.get('steps') if isinstance(job_config, dict) else None
+        for step in steps if isinstance(steps, list) else []:
+            if not isinstance(step, dict):
+                continue
+            uses = step.get('uses')
+            step_inputs = step.get('with')
+            if not (isinstance(uses, str) and uses.startswith('github/codeql-action/init')):
+                continue
+            if isinstance(step_inputs, dict):
+                config = {
+                    key: str(step_inputs[key])
+                    for key in ('config', 'config-file') if key in step_inputs
+                }
+                if config:
+                    configs.append(config)
+
+    return configs
+
+
+class WorkflowCache:
+    """JSON cache of the CodeQL settings extracted from workflow files.
+
+    Entries are keyed on the SHA-256 of the file content, so unchanged
+    workflows are never parsed twice, whatever their path or mtime. Entries
+    are kept least recently used first; get() and set() may be called from
+    the scan_workflows thread pool.
+    """
+
+    def __init__(self, cache_path: Path = DEFAULT_WORKFLOW_CACHE_PATH):
+        """
+        Load the cache.
+
+        Args:
+            cache_path: Path to the JSON cache file
+        """
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == WORKFLOW_CACHE_VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a content hash, if any, marking it most recently used."""
+        with self.lock:
+            entry = self.entries.pop(digest, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.entries and next(reversed(self.entries)) != digest:
+                self.dirty = True
+            self.entries[digest] = entry
+            return entry
+
+    def set(self, digest: str, entry: Dict[str, Any]) -> None:
+        """Cache the settings extracted from a file."""
+        with self.lock:
+            self.entries.pop(digest, None)
+            self.entries[digest] = entry
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache back, keeping the most recently used entries."""
+        if not self.dirty:
+            return
+        entries = dict(list(self.entries.items())[-WORKFLOW_CACHE_MAX_ENTRIES:])
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temporary file, so concurrent runs never write to the same one
+        tmp = tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=str(self.cache_path.parent),
+            prefix=f'.{self.cache_path.name}.', suffix='.tmp', delete=False
+        )
+        try:
+            with tmp as f:
+                json.dump({'version': WORKFLOW_CACHE_VERSION, 'entries': entries}, f)
+            os.replace(tmp.name, self.cache_path)
+        except BaseException:
+            try:
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+            raise
+        self.dirty = False
+
+
+def find_workflows(repo_path: Path) -> List[Path]:
+    """List the workflow files of a repository, sorted by name."""
+    workflows_dir = repo_path / '.github' / 'workflows'
+    if not workflows_dir.is_dir():
+        return []
+    return sorted(
+        path for path in workflows_dir.iterdir()
+        if path.suffix in ('.yml', '.yaml') and path.is_file()
+    )
+
+
+def parse_workflow(
+    workflow_path: Path,
+    cache: Optional[WorkflowCache] = None,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Read a workflow file and extract its CodeQL settings.
+
+    Args:
+        workflow_path: Path to the workflow YAML file
+        cache: Parsed-workflow cache, if any
+
+    Returns:
+        Tuple of (entry, error message or None). The entry maps 'languages'
+        to the languages per CodeQL job (see extract_codeql_languages) and
+        'configs' to the configuration inputs (see extract_codeql_configs).
+    """
+    try:
+        data = workflow_path.read_bytes()
+    except OSError as e:
+        return {'languages': {}, 'configs': []}, f"cannot read workflow: {e}"
+
+    digest = hashlib.sha256(data).hexdigest()
+    if cache is not None:
+        entry = cache.get(digest)
+        if entry is not None:
+            return entry, None
+
+    try:
+        workflow = yaml.load(data, Loader=YAML_LOADER)
+    except yaml.YAMLError as e:
+        return {'languages': {}, 'configs': []}, f"invalid YAML: {' '.join(str(e).split())}"
+
+    entry = {
+        'languages': extract_codeql_languages(workflow),
+        'configs': extract_codeql_configs(workflow),
+    }
+    if cache is not None:
+        cache.set(digest, entry)
+    return entry, None
+
+
+def scan_workflows(
+    workflow_paths: List[Path],
+    jobs: int = 4,
+    cache: Optional[WorkflowCache] = None,
+) -> List[Tuple[Path, Dict[str, Any], Optional[str]]]:
+    """
+    Parse workflow files in a thread pool.
+
+    Returns:
+        List of (workflow path, entry, error or None), in the order of
+        workflow_paths (see parse_workflow)
+    """
+    def parse(workflow_path: Path) -> Tuple[Path, Dict[str, Any], Optional[str]]:
+        return (workflow_path, *parse_workflow(workflow_path, cache))
+
+    if jobs <= 1 or len(workflow_paths) <= 1:
+        return [parse(workflow_path) for workflow_path in workflow_paths]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(parse, workflow_paths))
+
+
+def validate_all_workflows(
+    repo_path: Path,
+    detected_languages: Optional[Dict[str, int]] = None,
+    jobs: int = 4,
+    cache: Optional[WorkflowCache] = None,
+    minor: Optional[Set[str]] = None,
+) -> Tuple[bool, List[str], List[str]]:
+    """
+    Validate the CodeQL languages of every workflow under .github/workflows.
+
+    A language configured in any CodeQL job but absent from the repository
+    is an error. A detected language that a workflow with CodeQL jobs does
+    not configure in any of its jobs is a warning.
+
+    Args:
+        repo_path: Path to the repository root
+        detected_languages: Result of detect_languages_in_repo(), if known
+        jobs: Number of threads used to parse workflows
+        cache: Parsed-workflow cache, if any
+        minor: Languages too small to require analysis (see minor_languages);
+            they are not reported as missing
+
+    Returns:
+        Tuple of (is_valid, list of errors, list of warnings)
+    """
+    errors = []
+    warnings = []
+
+    workflow_paths = find_workflows(repo_path)
+    if not workflow_paths:
+        errors.append(f"No workflows found in: {repo_path / '.github' / 'workflows'}")
+        return False, errors, warnings
+
+    if detected_languages is None:
+        detected_languages = detect_languages_in_repo(repo_path)
+    detected_set = set(detected_languages)
+    required_set = detected_set - (minor or set())
+
+    codeql_workflows = 0
+    for workflow_path, entry, error in scan_workflows(workflow_paths, jobs, cache):
+        name = workflow_path.name
+        if error:
+            errors.append(f"{name}: {error}")
+            continue
+        job_languages = entry['languages']
+        if not job_languages:
+            continue
+
+        codeql_workflows += 1
+        configured_set = set()
+        for job_name, languages in job_languages.items():
+            if not languages:
+                warnings.append(f"{name}: CodeQL job '{job_name}' has no language configuration")
+            for lang in languages:
+                configured_set.add(lang)
+                if lang not in detected_set:
+                    errors.append(
+                        f"{name}: job '{job_name}' configures language '{lang}' but no {lang.upper()} "
+                        f"files found in repository. This will cause CodeQL analysis to fail."
+                    )
+
+        for lang in sorted(required_set - configured_set):
+            warnings.append(
+                f"{name}: language '{lang}' has {detected_languages[lang]} files in repository "
+                f"but is not configured in any CodeQL job. Consider adding it for security scanning."
+            )
+
+    if codeql_workflows == 0:
+        errors.append("Could not find CodeQL language configuration in any workflow")
+
+    return len(errors) == 0, errors, warnings
+
+
+@dataclass
+class ExcludedFile:
+    """A source file CodeQL should not analyse."""
+
+    path: str
+    language: str
+    category: str
+    reason: str
+    lines: int
+
+
+def read_gitattributes(path: Path, base: str) -> List[Tuple[IgnoreRule, Dict[str, bool]]]:
+    """
+    Read the linguist-vendored and linguist-generated settings of a .gitattributes file.
+
+    Args:
+        path: Path to the .gitattributes file
+        base: Directory of the file relative to the repository root ('' for the root)
+
+    Returns:
+        List of (pattern, {attribute: set or unset}) in file order
+    """
+    try:
+        lines = path.read_text(encoding='utf-8', errors='replace').splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        attributes = {}
+        for field in fields[1:]:
+            name, _, value = field.lstrip('-!').partition('=')
+            if name in ('linguist-vendored', 'linguist-generated'):
+                attributes[name] = not field.startswith(('-', '!')) and value not in ('false', '0')
+        if attributes:
+            rules.append((IgnoreRule(base, fields[0]), attributes))
+    return rules
+
+
+def linguist_attributes(
+    rules: List[Tuple[IgnoreRule, Dict[str, bool]]], rel_path: str
+) -> Dict[str, bool]:
+    """Resolve the linguist attributes of a file; later matching rules win."""
+    attributes = {}
+    for rule, values in rules:
+        if rule.matches(rel_path, False):
+            attributes.update(values)
+    return attributes
+
+
+def classify_source_file(
+    file: FileEntry, attributes: Dict[str, bool]
+) -> Optional[Tuple[str, str]]:
+    """
+    Classify a source file as vendored, minified or generated.
+
+    .gitattributes settings win over path conventions, which win over
+    content heuristics. A file is only minified by content when most lines
+    of its first block are long, and never when it carries the repository's
+    copyright header.
+
+    Args:
+        file: File to classify
+        attributes: Its linguist attributes (see linguist_attributes)
+
+    Returns:
+        Tuple of (category, reason), or None for hand-written first-party code
+    """
+    if attributes.get('linguist-vendored'):
+        return 'vendored', '.gitattributes linguist-vendored'
+    if attributes.get('linguist-generated'):
+        return 'generated', '.gitattributes linguist-generated'
+
+    if attributes.get('linguist-vendored') is None:
+        for part in file.rel_path.split('/')[:-1]:
+            if part in VENDOR_DIR_NAMES:
+                return 'vendored', f"inside a {part}/ directory"
+
+    if MINIFIED_NAME_PATTERN.search(file.name):
+        return 'minified', 'minified file name'
+    if attributes.get('linguist-generated') is None:
+        source = build_variant_source(file.path)
+        if source is not None:
+            return 'generated', f"build output of {source.name}"
+        if GENERATED_NAME_PATTERN.search(file.name):
+            return 'generated', 'generated code file name'
+
+    if file.size > MAX_SOURCE_SIZE:
+        return 'generated', f"larger than {MAX_SOURCE_SIZE} bytes"
+
+    with open(file.path, 'rb') as f:
+        head = f.read(SNIFF_SIZE)
+    lines = head.split(b'\n')
+    long_lines = sum(1 for line in lines if len(line) >= MINIFIED_LINE_LENGTH)
+    if long_lines * 2 > len(lines) and not all(marker in head for marker in COPYRIGHT_HEADER_MARKERS):
+        return 'minified', f"mostly lines of {MINIFIED_LINE_LENGTH}+ characters"
+    if attributes.get('linguist-generated') is None and any(
+        marker in head[:GENERATED_WINDOW] for marker in GENERATED_MARKERS
+    ):
+        return 'generated', 'generated-code marker'
+
+    return None
+
+
+def analyze_exclusions(
+    repo_path: Path, files: Optional[Iterable[FileEntry]] = None
+) -> Tuple[List[ExcludedFile], List[str]]:
+    """
+    Find the vendored, minified and generated source files CodeQL would analyse.
+
+    Only files in a language CodeQL analyses are considered. By default the
+    repository is walked as by checkout_files.
+
+    Args:
+        repo_path: Path to the repository root
+        files: Files already found by checkout_files
+
+    Returns:
+        Tuple of (excluded files, proposed paths-ignore patterns)
+    """
+    if files is None:
+        files = checkout_files(repo_path)
+    files = list(files)
+
+    rules = []
+    for file in files:
+        if file.name == '.gitattributes':
+            base = file.rel_path.rpartition('/')[0]
+            rules.extend(read_gitattributes(file.path, base))
+
+    excluded = []
+    sources = []
+    for file in files:
+        dot = file.name.rfind('.')
+        language = EXTENSION_LANGUAGES.get(file.name[dot:]) if dot != -1 else None
+        if language is None:
+            continue
+        sources.append(file.rel_path)
+        try:
+            classification = classify_source_file(file, linguist_attributes(rules, file.rel_path))
+            if classification is not None:
+                excluded.append(ExcludedFile(
+                    file.rel_path, language, *classification, count_code_lines(file.path)
+                ))
+        except OSError as e:
+            print(f"Warning: cannot read {file.rel_path}: {e}", file=sys.stderr)
+
+    return excluded, propose_paths_ignore([item.path for item in excluded], sources)
+
+
+def propose_paths_ignore(excluded: List[str], sources: List[str]) -> List[str]:
+    """
+    Build paths-ignore patterns covering the excluded files.
+
+    Each file is covered by the highest directory that holds only excluded
+    source files (as ``dir/**``), or by its own path.
+
+    Args:
+        excluded: Paths of the excluded files, relative to the repository root
+        sources: Paths of all source files, relative to the repository root
+
+    Returns:
+        Sorted list of patterns
+    """
+    totals = Counter()
+    for path in sources:
+        parts = path.split('/')[:-1]
+        for depth in range(1, len(parts) + 1):
+            totals['/'.join(parts[:depth])] += 1
+
+    excluded_totals = Counter()
+    for path in excluded:
+        parts = path.split('/')[:-1]
+        for depth in range(1, len(parts) + 1):
+            excluded_totals['/'.join(parts[:depth])] += 1
+
+    patterns = set()
+    for path in excluded:
+        parts = path.split('/')[:-1]
+        for depth in range(1, len(parts) + 1):
+            directory = '/'.join(parts[:depth])
+            if totals[directory] == excluded_totals[directory]:
+                patterns.add(f"{directory}/**")
+                break
+        else:
+            patterns.add(path)
+
+    return sorted(patterns)
+
+
+def config_has_paths_ignore(repo_path: Path, configs: List[Dict[str, str]]) -> Optional[bool]:
+    """
+    Check whether the CodeQL configuration of a workflow sets paths-ignore.
+
+    Args:
+        repo_path: Path to the repository root
+        configs: Configuration inputs of the workflow (see extract_codeql_configs)
+
+    Returns:
+        True or False, or None when the configuration is in another file or
+        repository that cannot be checked
+    """
+    unknown = False
+    for config in configs:
+        if 'workflow' in config:
+            unknown = True
+        documents = []
+        if 'config' in config:
+            documents.append(config['config'])
+        config_file = config.get('config-file')
+        if config_file:
+            if '@' in config_file or '${{' in config_file:
+                unknown = True
+            else:
+                try:
+                    documents.append((repo_path / config_file).read_text(encoding='utf-8'))
+                except OSError:
+                    pass
+
+        for document in documents:
+            try:
+                data = yaml.load(document, Loader=YAML_LOADER)
+            except yaml.YAMLError:
+                continue
+            if isinstance(data, dict) and data.get('paths-ignore'):
+                return True
+
+    return None if unknown else False
+
+
+def paths_ignore_warnings(
+    repo_path: Path,
+    workflow_paths: List[Path],
+    excluded: List[ExcludedFile],
+    jobs: int = 4,
+    cache: Optional[WorkflowCache] = None,
+) -> List[str]:
+    """Warn about CodeQL workflows that analyse excluded files because they set no paths-ignore."""
+    if not excluded:
+        return []
+
+    warnings = []
+    lines = sum(item.lines for item in excluded)
+    for workflow_path, entry, error in scan_workflows(workflow_paths, jobs, cache):
+        if error or not entry['languages']:
+            continue
+        if config_has_paths_ignore(repo_path, entry['configs']) is False:
+            warnings.append(
+                f"{workflow_path.name}: CodeQL analyses {len(excluded)} vendored, minified or generated "
+                f"files (~{lines} lines) because no paths-ignore is configured. "
+                f"Use --emit-config to write one."
+            )
+    return warnings
+
+
+def print_exclusion_report(excluded: List[ExcludedFile], paths_ignore: List[str]) -> None:
+    """Print excluded lines of code per language and the proposed paths-ignore."""
+    if not excluded:
+        print("No vendored, minified or generated source files found")
+        print()
+        return
+
+    print("Vendored, minified and generated source files:")
+    for item in excluded:
+        print(f"  - {item.path} ({item.language}, {item.category}: {item.reason}, {item.lines} lines)")
+    print()
+
+    lines = Counter()
+    files = Counter()
+    for item in excluded:
+        lines[item.language] += item.lines
+        files[item.language] += 1
+    print("Estimated lines of code excluded from analysis:")
+    for language in sorted(lines):
+        print(f"  - {language}: {lines[language]} lines in {files[language]} files")
+    print()
+
+    print("Proposed CodeQL configuration:")
+    for line in yaml.safe_dump({'paths-ignore': paths_ignore}, sort_keys=False).splitlines():
+        print(f"  {line}")
+    print()
+
+
+def write_codeql_config(config_path: Path, paths_ignore: List[str]) -> None:
+    """Write paths-ignore into a CodeQL configuration file, keeping its other settings."""
+    config = {}
+    if config_path.exists():
+        config = yaml.load(config_path.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
+    config['paths-ignore'] = paths_ignore
+
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False), encoding='utf-8')
+
+
+def validate_codeql_config(
+    repo_path: Path,
+    workflow_path: Path,
+    detected_languages: Optional[Dict[str, int]] = None,
+    minor: Optional[Set[str]] = None,
+) -> Tuple[bool, List[str], List[str]]:
     """
     Validate that CodeQL workflow languages match repository contents.
 
     Args:
         repo_path: Path to the repository root
         workflow_path: Path to the CodeQL workflow file
+        detected_languages: Result of detect_languages_in_repo() if the caller
+            already has it; otherwise the repository is scanned
+        minor: Languages too small to require analysis (see minor_languages);
+            they are not reported as missing
 
     Returns:
         Tuple of (is_valid, list of errors, list of warnings)
@@ -135,7 +1038,8 @@ def validate_codeql_config(repo_path: Path, workflow_path: Path) -> Tuple[bool,
         return False, errors, warnings
 
     # Detect languages in repository
-    detected_languages = detect_languages_in_repo(repo_path)
+    if detected_languages is None:
+        detected_languages = detect_languages_in_repo(repo_path)
 
     if not detected_languages:
         warnings.append("No supported programming languages detected in repository")
@@ -166,7 +1070,7 @@ def validate_codeql_config(repo_path: Path, workflow_path: Path) -> Tuple[bool,
             )
 
     # Languages present but not configured
-    missing_languages = detected_set - configured_set
+    missing_languages = detected_set - configured_set - (minor or set())
     if missing_languages:
         for lang in missing_languages:
             file_count = detected_languages[lang]
@@ -195,6 +1099,48 @@ def main():
         type=Path,
         help='Path to CodeQL workflow file (default: .github/workflows/codeql-analysis.yml)'
     )
+    parser.add_argument(
+        '--all-workflows',
+        action='store_true',
+        help='Validate the CodeQL configuration of every workflow in .github/workflows'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=4,
+        help='Threads used to parse workflows with --all-workflows (default: 4)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not use the parsed-workflow cache (default location: {DEFAULT_WORKFLOW_CACHE_PATH})'
+    )
+    parser.add_argument(
+        '--min-share',
+        type=float,
+        default=MIN_LANGUAGE_SHARE,
+        metavar='PERCENT',
+        help=f'Languages with a smaller share of source lines are info only (default: {MIN_LANGUAGE_SHARE})'
+    )
+    parser.add_argument(
+        '--min-lines',
+        type=int,
+        default=MIN_LANGUAGE_LINES,
+        help=f'Languages with fewer non-blank lines are info only (default: {MIN_LANGUAGE_LINES})'
+    )
+    parser.add_argument(
+        '--paths-ignore',
+        action='store_true',
+        help='Report vendored, minified and generated source files and propose a CodeQL paths-ignore'
+    )
+    parser.add_argument(
+        '--emit-config',
+        type=Path,
+        nargs='?',
+        const=DEFAULT_CODEQL_CONFIG_PATH,
+        metavar='FILE',
+        help=f'Write the proposed paths-ignore into a CodeQL config file (default: {DEFAULT_CODEQL_CONFIG_PATH})'
+    )
     parser.add_argument(
         '--strict',
         action='store_true',
@@ -213,19 +1159,74 @@ def main():
 
     print(f"Validating CodeQL configuration...")
     print(f"Repository: {repo_path}")
-    print(f"Workflow: {workflow_path}")
+    if args.all_workflows:
+        print(f"Workflows: {repo_path / '.github' / 'workflows'}")
+    else:
+        print(f"Workflow: {workflow_path}")
     print()
 
-    # Detect languages first for informational purposes
-    detected_languages = detect_languages_in_repo(repo_path)
+    # Detect languages first for informational purposes; detection,
+    # measurement and the exclusion analysis below share one walk
+    files = checkout_files(repo_path)
+    detected_languages = detect_languages_in_repo(repo_path, files=files)
+    language_stats = measure_languages(repo_path, files=files)
+    minor = minor_languages(language_stats, args.min_share, args.min_lines)
     if detected_languages:
         print("Detected languages in repository:")
-        for lang, count in sorted(detected_languages.items()):
-            print(f"  - {lang}: {count} files")
+        for lang, totals in sorted(language_stats.items()):
+            print(
+                f"  - {lang}: {totals.files} files, {totals.bytes} bytes, {totals.lines} lines "
+                f"({language_share(language_stats, lang):.1f}%)"
+            )
+        print()
+
+    if minor:
+        print("ℹ️  INFO:")
+        for lang in sorted(minor):
+            print(
+                f"  - Language '{lang}' is below the minimum size ({args.min_share}% or "
+                f"{args.min_lines} lines); CodeQL analysis is optional"
+            )
         print()
 
     # Validate configuration
-    is_valid, errors, warnings = validate_codeql_config(repo_path, workflow_path)
+    cache = None if args.no_cache else WorkflowCache()
+    if args.all_workflows:
+        workflow_paths = find_workflows(repo_path)
+        is_valid, errors, warnings = validate_all_workflows(
+            repo_path, detected_languages, args.jobs, cache, minor
+        )
+    else:
+        workflow_paths = [workflow_path] if workflow_path.exists() else []
+        is_valid, errors, warnings = validate_codeql_config(
+            repo_path, workflow_path, detected_languages, minor
+        )
+
+    # Look for code CodeQL should not analyse
+    if args.paths_ignore or args.emit_config:
+        excluded, paths_ignore = analyze_exclusions(repo_path, files)
+        print_exclusion_report(excluded, paths_ignore)
+
+        if args.emit_config and paths_ignore:
+            config_path = args.emit_config
+            if not config_path.is_absolute():
+                config_path = repo_path / config_path
+            try:
+                write_codeql_config(config_path, paths_ignore)
+                print(f"Wrote paths-ignore to: {config_path}")
+                print("Reference it with the config-file input of github/codeql-action/init")
+                print()
+            except (OSError, yaml.YAMLError) as e:
+                errors.append(f"Could not write CodeQL config {config_path}: {e}")
+                is_valid = False
+        else:
+            warnings.extend(paths_ignore_warnings(repo_path, workflow_paths, excluded, args.jobs, cache))
+
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"Warning: could not save workflow cache: {e}", file=sys.stderr)
 
     # Print results
     if errors: